@@ -6,7 +6,7 @@ import os.path
 import pkg_resources
 import signal
 
-from tornado import ioloop, web
+from tornado import gen, ioloop, iostream, web
 
 from sample import simple_handlers
 
@@ -89,17 +89,79 @@ class SwaggerHandler(web.RequestHandler):
         state['digest'] = hashlib.md5(raw_data).hexdigest()
 
 
+class SharedSwaggerHandler(web.RequestHandler):
+    """
+    Serves the API definition from a memory-mapped artifact.
+
+    Generate the artifact by setting ``swagger_artifact_file`` in the
+    sphinx configuration.  Every process that serves the application
+    shares the same mapping of the artifact.
+
+    The body is written in slices of :attr:`CHUNK_SIZE` bytes and each
+    slice is flushed before the next is copied out of the mapping.
+
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def initialize(self, swagger_path):
+        super(SharedSwaggerHandler, self).initialize()
+        spec = self.application.settings.get('shared_swagger')
+        if spec is None:
+            from sphinxswagger import serving
+            spec = serving.SharedSpec(swagger_path)
+            self.application.settings['shared_swagger'] = spec
+        self.spec = spec
+
+    def prepare(self):
+        self.encoding = self.spec.select(
+            self.request.headers.get('Accept-Encoding'))
+
+    def compute_etag(self):
+        return '"{}"'.format(self.spec.etags[self.encoding])
+
+    def head(self):
+        """Retrieve API definition metadata."""
+        self.set_header('Content-Type', self.spec.content_type)
+        self.set_header('Vary', 'Accept-Encoding')
+        self.set_etag_header()
+        self.set_status(204)
+
+    @gen.coroutine
+    def get(self):
+        """Retrieve the API definition."""
+        self.set_header('Vary', 'Accept-Encoding')
+        self.set_etag_header()
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+        self.set_header('Content-Type', self.spec.content_type)
+        if self.encoding != 'identity':
+            self.set_header('Content-Encoding', self.encoding)
+        body = self.spec.body(self.encoding)
+        self.set_header('Content-Length', len(body))
+        for start in range(0, len(body), self.CHUNK_SIZE):
+            self.write(bytes(body[start:start + self.CHUNK_SIZE]))
+            try:
+                yield self.flush()
+            except iostream.StreamClosedError:
+                return
+
+
 class Application(web.Application):
 
     def __init__(self, io_loop=None, **kwargs):
         self.io_loop = kwargs.pop('io_loop', ioloop.IOLoop.current())
-        swagger_path = pkg_resources.resource_filename('sample',
-                                                       'swagger.json')
+        swagger_handler = kwargs.pop('swagger_handler', SwaggerHandler)
+        swagger_path = kwargs.pop('swagger_path', None)
+        if swagger_path is None:
+            swagger_path = pkg_resources.resource_filename('sample',
+                                                           'swagger.json')
         super(Application, self).__init__(
             [web.url('/ip', simple_handlers.IPHandler),
              web.url('/echo', simple_handlers.MethodHandler),
              web.url('/status/(?P<code>\d+)', simple_handlers.StatusHandler),
-             web.url('/swagger.json', SwaggerHandler,
+             web.url('/swagger.json', swagger_handler,
                      {'swagger_path': swagger_path})],
             **kwargs)
 
@@ -0,0 +1,94 @@
+"""
+Check what importing parts of sphinxswagger costs.
+
+Imports each module in a fresh interpreter with ``-X importtime``,
+reports the cumulative import time of the module and its heaviest
+dependencies, and fails if a module pulls in a package that it should
+not, or takes longer than the budget::
+
+   $ python -m sample.importcheck sphinxswagger.command \\
+        --forbid sphinx docutils --budget-ms 50
+
+Loading the setup commands must not import Sphinx since setuptools
+imports every command when *setup.py* runs, so that is what is checked
+when no arguments are given.  Timings are the best of several runs
+since the first import also pays for reading byte code from disk.
+
+"""
+import argparse
+import subprocess
+import sys
+
+
+def import_times(module):
+    """
+    Import `module` in a fresh interpreter.
+
+    :param str module: the name of the module to import
+    :return: mapping of every imported module name to its cumulative
+        import time in microseconds
+    :rtype: dict
+
+    """
+    process = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True)
+    _, stderr = process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError('importing {} failed:\n{}'.format(module, stderr))
+    times = {}
+    for line in stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            cumulative = int(fields[1])
+        except ValueError:  # the header line
+            continue
+        times[fields[2].strip()] = cumulative
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('modules', nargs='*',
+                        default=['sphinxswagger.command'])
+    parser.add_argument('--forbid', nargs='*', default=['sphinx', 'docutils'],
+                        help='packages that must not be imported')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='fail if an import takes longer than this')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5,
+                        help='number of the heaviest dependencies to list')
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: times.get(module, 0))
+        elapsed = best.get(module, 0) / 1000.0
+        print('{:<40} {:>9.1f} ms'.format(module, elapsed))
+        heaviest = sorted((name for name in best if name != module),
+                          key=best.get, reverse=True)
+        for name in heaviest[:args.top]:
+            print('    {:<36} {:>9.1f} ms'.format(name, best[name] / 1000.0))
+
+        for package in args.forbid:
+            imported = [name for name in best
+                        if name == package or name.startswith(package + '.')]
+            if imported:
+                failures.append('{} imports {} ({} modules)'.format(
+                    module, package, len(imported)))
+        if args.budget_ms is not None and elapsed > args.budget_ms:
+            failures.append('{} took {:.1f} ms, the budget is {} ms'.format(
+                module, elapsed, args.budget_ms))
+
+    for failure in failures:
+        print('FAIL: ' + failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+Offline load test for serving the API definition.
+
+Starts :class:`sample.app.Application` on a loopback port in a child
+process and drives requests for */swagger.json* from an asyncio client::
+
+   $ python -m sample.loadtest --requests 5000 --concurrency 50 \\
+        --mode conditional --swagger-path sample/swagger.json
+
+Use ``--handler`` to swap in a different handler implementation.  For
+example, :class:`StaticSwaggerHandler` shows the effect of removing the
+per-request ``getmtime``, parse, and re-serialize that
+:class:`sample.app.SwaggerHandler` performs::
+
+   $ python -m sample.loadtest --handler sample.loadtest:StaticSwaggerHandler
+
+"""
+import argparse
+import asyncio
+import hashlib
+import importlib
+import multiprocessing
+import time
+
+from tornado import httpserver, ioloop, netutil, web
+
+from sample import app
+
+
+class StaticSwaggerHandler(web.RequestHandler):
+    """Serves the API definition from bytes that are read once."""
+
+    def initialize(self, swagger_path):
+        super(StaticSwaggerHandler, self).initialize()
+        state = self.application.settings.get('static_swagger')
+        if state is None:
+            with open(swagger_path, 'rb') as f:
+                body = f.read()
+            state = {'body': body, 'etag': hashlib.md5(body).hexdigest()}
+            self.application.settings['static_swagger'] = state
+        self.state = state
+
+    def compute_etag(self):
+        return self.state['etag']
+
+    def head(self):
+        self.set_header('Content-Type', 'application/json')
+        self.set_header('ETag', self.state['etag'])
+        self.set_status(204)
+
+    def get(self):
+        if self.request.headers.get('If-None-Match') == self.state['etag']:
+            self.set_status(304)
+            return
+        self.set_header('Content-Type', 'application/json')
+        self.write(self.state['body'])
+
+
+def import_handler(spec):
+    """Import a handler class from a ``module:name`` specification."""
+    module_name, _, class_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def run_server(handler_spec, swagger_path, connection):
+    """Run the sample application and send its port over `connection`."""
+    sockets = netutil.bind_sockets(0, '127.0.0.1')
+    application = app.Application(
+        swagger_handler=import_handler(handler_spec),
+        swagger_path=swagger_path)
+    server = httpserver.HTTPServer(application)
+    server.add_sockets(sockets)
+    connection.send(sockets[0].getsockname()[1])
+    connection.close()
+    ioloop.IOLoop.current().start()
+
+
+async def fetch(reader, writer, method, headers=None):
+    """
+    Send a single request on a keep-alive connection.
+
+    :return: ``(status, headers)`` tuple
+    :rtype: tuple
+
+    """
+    request = ['{} /swagger.json HTTP/1.1'.format(method),
+               'Host: 127.0.0.1']
+    request.extend('{}: {}'.format(*item) for item in (headers or {}).items())
+    writer.write(('\r\n'.join(request) + '\r\n\r\n').encode('ascii'))
+
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    response_headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        response_headers[name.strip().lower()] = value.strip()
+
+    length = int(response_headers.get('content-length', 0))
+    if method != 'HEAD' and length:
+        await reader.readexactly(length)
+    return status, response_headers
+
+
+async def worker(port, mode, count, latencies, etag):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    method = 'HEAD' if mode == 'head' else 'GET'
+    headers = {'If-None-Match': etag} if mode == 'conditional' else None
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            await fetch(reader, writer, method, headers)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def drive(port, mode, requests, concurrency):
+    """Issue `requests` requests over `concurrency` connections."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    _, headers = await fetch(reader, writer, 'GET')
+    writer.close()
+    etag = headers.get('etag', '')
+
+    latencies = []
+    per_worker, extra = divmod(requests, concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        worker(port, mode, per_worker + (1 if i < extra else 0), latencies,
+               etag)
+        for i in range(concurrency)])
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def percentile(ordered, fraction):
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--handler', default='sample.app:SwaggerHandler',
+                        help='handler class as module:name')
+    parser.add_argument('--swagger-path', default=None,
+                        help='API definition to serve')
+    parser.add_argument('--mode', default='get',
+                        choices=['get', 'head', 'conditional'])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=10)
+    args = parser.parse_args()
+
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(
+        target=run_server, args=(args.handler, args.swagger_path, child))
+    server.start()
+    try:
+        port = parent.recv()
+        loop = asyncio.new_event_loop()
+        elapsed, latencies = loop.run_until_complete(
+            drive(port, args.mode, args.requests, args.concurrency))
+        loop.close()
+    finally:
+        server.terminate()
+        server.join()
+
+    print('handler:     {}'.format(args.handler))
+    print('mode:        {} x {} connections'.format(
+        args.mode, args.concurrency))
+    print('requests:    {}'.format(len(latencies)))
+    print('throughput:  {:.1f} req/s'.format(len(latencies) / elapsed))
+    print('p50 latency: {:.2f} ms'.format(percentile(latencies, 0.5) * 1000))
+    print('p99 latency: {:.2f} ms'.format(percentile(latencies, 0.99) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark rendering paragraphs into Markdown.
+
+Builds paragraphs of inline markup -- references, literals, emphasis,
+and strong text -- nested to increasing depths and renders them three
+ways:
+
+* *chunk stack* is the renderer that used to collect chunks and
+  re-join the saved slice whenever a span of markup ended
+* *buffer* is :class:`sphinxswagger.writer.ParagraphVisitor` which
+  appends every piece to one buffer once
+* *cached* renders the paragraphs through the per-document cache that
+  the translator uses, starting from an empty cache on every repeat
+
+The paragraphs are copies of ``--distinct`` different paragraphs, like
+boilerplate that repeats across the endpoints of a document::
+
+   $ python -m sample.renderbench --depth 1 4 16 --paragraphs 200 \
+       --distinct 10
+
+"""
+import argparse
+import itertools
+import time
+
+from docutils import nodes, utils
+
+from sphinxswagger import writer
+
+
+class ChunkStackVisitor(nodes.SparseNodeVisitor):
+    """The previous paragraph renderer, kept for comparison."""
+
+    def __init__(self, document):
+        nodes.SparseNodeVisitor.__init__(self, document)
+        self.chunks = []
+        self._stack = []
+
+    def get_paragraph(self):
+        return ' '.join(' '.join(chunk.strip().split())
+                        for chunk in self.chunks
+                        if chunk.strip())
+
+    def _push_position(self):
+        self._stack.append(len(self.chunks))
+
+    def _pop_saved_chunks(self):
+        start = self._stack.pop()
+        content = ' '.join(self.chunks[start:])
+        del self.chunks[start:]
+        return content
+
+    def visit_Text(self, node):
+        self.chunks.append(node.astext())
+        raise nodes.SkipChildren
+
+    def visit_reference(self, _):
+        self._push_position()
+
+    def depart_reference(self, node):
+        if 'refuri' in node.attributes:
+            content = self._pop_saved_chunks()
+            self.chunks.append('[{}]({})'.format(content,
+                                                 node.attributes['refuri']))
+        else:
+            self._stack.pop()
+
+    def visit_literal(self, _):
+        self._push_position()
+
+    def depart_literal(self, _):
+        self.chunks.append('`{}`'.format(self._pop_saved_chunks()))
+
+    def visit_emphasis(self, _):
+        self._push_position()
+
+    def depart_emphasis(self, _):
+        self.chunks.append('*{}*'.format(self._pop_saved_chunks()))
+
+    def visit_strong(self, _):
+        self._push_position()
+
+    def depart_strong(self, _):
+        self.chunks.append('**{}**'.format(self._pop_saved_chunks()))
+
+
+def make_paragraph(index, depth, words):
+    """Build a paragraph whose markup is nested `depth` levels deep."""
+    factories = itertools.cycle([
+        lambda: nodes.reference(refuri='https://example.com/{}'.format(
+            index)),
+        nodes.emphasis, nodes.strong, nodes.literal])
+    paragraph = nodes.paragraph()
+    parent = paragraph
+    for level in range(depth):
+        text = ' '.join('word{}'.format(n) for n in range(words))
+        parent += nodes.Text('{} level {} '.format(text, level))
+        child = next(factories)()
+        parent += child
+        parent = child
+    parent += nodes.Text('paragraph {}'.format(index))
+    return paragraph
+
+
+def render(document, paragraphs, visitor_class):
+    rendered = []
+    for paragraph in paragraphs:
+        visitor = visitor_class(document)
+        paragraph.walkabout(visitor)
+        rendered.append(visitor.get_paragraph())
+    return rendered
+
+
+def render_cached(document, paragraphs):
+    return [writer._render_paragraph(document, paragraph)
+            for paragraph in paragraphs]
+
+
+def best_time(function, repeat, setup=lambda: None):
+    """
+    Return the best time of `repeat` calls in seconds.
+
+    `setup` is called untimed before each call and its result is
+    passed to `function`.
+
+    """
+    best = None
+    for _ in range(repeat):
+        argument = setup()
+        start = time.perf_counter()
+        function(argument)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--depth', type=int, nargs='+', default=[1, 4, 16],
+                        help='levels of nested inline markup')
+    parser.add_argument('--paragraphs', type=int, default=200)
+    parser.add_argument('--distinct', type=int, default=10,
+                        help='number of different paragraphs')
+    parser.add_argument('--words', type=int, default=8,
+                        help='words of text at each level')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print('{:>6} {:>16} {:>11} {:>11}'.format(
+        'depth', 'chunk stack ms', 'buffer ms', 'cached ms'))
+    for depth in args.depth:
+        document = utils.new_document('<renderbench>')
+        paragraphs = [make_paragraph(index % args.distinct, depth,
+                                     args.words)
+                      for index in range(args.paragraphs)]
+        expected = render(document, paragraphs, ChunkStackVisitor)
+        assert render(document, paragraphs,
+                      writer.ParagraphVisitor) == expected
+        assert render_cached(document, paragraphs) == expected
+        print('{:>6} {:>16.3f} {:>11.3f} {:>11.3f}'.format(
+            depth,
+            best_time(lambda _: render(document, paragraphs,
+                                       ChunkStackVisitor),
+                      args.repeat) * 1000,
+            best_time(lambda _: render(document, paragraphs,
+                                       writer.ParagraphVisitor),
+                      args.repeat) * 1000,
+            best_time(lambda cold: render_cached(cold, paragraphs),
+                      args.repeat,
+                      lambda: utils.new_document('<renderbench>')) * 1000))
+
+
+if __name__ == '__main__':
+    main()
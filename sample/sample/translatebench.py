@@ -0,0 +1,145 @@
+"""
+Benchmark translating mixed-content documents.
+
+Generates a Sphinx project whose documents contain a fixed number of
+HTTP endpoints among a growing amount of narrative -- sections,
+paragraphs with inline markup, tables, and code blocks -- and times the
+swagger translation of each document two ways:
+
+* *full walk* dispatches every node of the doctree through the
+  translator which is how documents used to be translated
+* *targeted* only walks the HTTP ``desc`` nodes that
+  :func:`sphinxswagger.endpoints.find_endpoint_nodes` finds::
+
+   $ python -m sample.translatebench --endpoints 3 --sections 10 100 1000
+
+"""
+import argparse
+import os.path
+import shutil
+import sys
+import tempfile
+import time
+
+from sphinx import application
+
+from sphinxswagger import document, endpoints, writer
+
+
+SECTION = """
+Section {index}
+-----------------------
+
+Narrative with *emphasis*, **strong text**, ``literals``, and a
+`link <https://example.com/{index}>`__ that the translator ignores.
+
+.. list-table::
+   :header-rows: 1
+
+   * - Name
+     - Value
+   * - first
+     - {index}
+
+.. code-block:: python
+
+   def example_{index}():
+       return {index}
+
+"""
+
+ENDPOINT = """
+.. http:get:: /things/{index}/(int:id)
+
+   Retrieve thing {index}.
+
+   More details about **thing** {index}.
+
+   :param int id: the identifier
+   :query string fields: the fields to return
+   :status 200: the thing was found
+   :status 404: there is no such thing
+
+"""
+
+
+def generate_project(root, sizes, endpoint_count):
+    """Write a project with one document per size in `sizes`."""
+    with open(os.path.join(root, 'conf.py'), 'w') as f:
+        f.write("project = 'bench'\nversion = '1.0'\n"
+                "master_doc = 'index'\n"
+                "extensions = ['sphinxcontrib.httpdomain', "
+                "'sphinxswagger']\n")
+    with open(os.path.join(root, 'index.rst'), 'w') as f:
+        f.write('Benchmark\n=========\n\n.. toctree::\n\n')
+        for size in sizes:
+            f.write('   doc{}\n'.format(size))
+    for size in sizes:
+        with open(os.path.join(root, 'doc{}.rst'.format(size)), 'w') as f:
+            f.write('Document {}\n=================\n'.format(size))
+            spacing = max(1, size // max(1, endpoint_count))
+            for index in range(size):
+                f.write(SECTION.format(index=index))
+                if index % spacing == 0 and index // spacing < endpoint_count:
+                    f.write(ENDPOINT.format(index=index))
+
+
+def time_translation(doctree, translate, repeat):
+    """Return the best time of `repeat` translations in seconds."""
+    best = None
+    for _ in range(repeat):
+        visitor = writer.SwaggerTranslator(doctree,
+                                           document.SwaggerDocument())
+        start = time.perf_counter()
+        translate(doctree, visitor)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def full_walk(doctree, visitor):
+    doctree.walkabout(visitor)
+
+
+def targeted(doctree, visitor):
+    for node in endpoints.find_endpoint_nodes(doctree):
+        node.walkabout(visitor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--endpoints', type=int, default=3,
+                        help='number of endpoints in each document')
+    parser.add_argument('--sections', type=int, nargs='+',
+                        default=[10, 100, 1000],
+                        help='number of narrative sections per document')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='translatebench-')
+    try:
+        generate_project(root, args.sections, args.endpoints)
+        app = application.Sphinx(root, root, os.path.join(root, '_build'),
+                                 os.path.join(root, '_doctrees'), 'swagger',
+                                 confoverrides={'swagger_file': ''},
+                                 status=None, warning=sys.stderr)
+        app.build()
+
+        print('{:>9} {:>8} {:>10} {:>14} {:>14}'.format(
+            'sections', 'nodes', 'endpoints', 'full walk ms',
+            'targeted ms'))
+        for size in args.sections:
+            docname = 'doc{}'.format(size)
+            doctree = app.env.get_and_resolve_doctree(docname, app.builder)
+            node_count = sum(1 for _ in doctree.traverse())
+            print('{:>9} {:>8} {:>10} {:>14.3f} {:>14.3f}'.format(
+                size, node_count,
+                app.env.swagger_endpoint_docs.get(docname, 0),
+                time_translation(doctree, full_walk, args.repeat) * 1000,
+                time_translation(doctree, targeted, args.repeat) * 1000))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
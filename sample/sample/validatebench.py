@@ -0,0 +1,150 @@
+"""
+Benchmark the compiled request validators.
+
+Compares :func:`sphinxswagger.validators.compile_operation` with the
+generic `jsonschema`_ validator on a representative operation -- path,
+query, and header parameters and a nested JSON request body -- for a
+valid and an invalid request::
+
+   $ pip install jsonschema
+   $ python -m sample.validatebench --iterations 20000
+
+Both validators are constructed once before timing and both collect
+every error in the request.
+
+.. _jsonschema: https://pypi.org/project/jsonschema/
+
+"""
+import argparse
+import sys
+import time
+
+from sphinxswagger import validators
+
+
+ITEM_SCHEMA = {
+    'type': 'object',
+    'required': ['sku', 'quantity'],
+    'properties': {
+        'sku': {'type': 'string'},
+        'quantity': {'type': 'integer'},
+        'price': {'type': 'number'},
+        'gift': {'type': 'boolean'},
+    },
+}
+
+OPERATION = {
+    'parameters': [
+        {'name': 'id', 'in': 'path', 'type': 'integer', 'required': True},
+        {'name': 'fields', 'in': 'query', 'type': 'string'},
+        {'name': 'limit', 'in': 'query', 'type': 'integer'},
+        {'name': 'verbose', 'in': 'query', 'type': 'boolean'},
+        {'name': 'X-Request-Id', 'in': 'header', 'type': 'string',
+         'required': True},
+        {'name': 'order', 'in': 'body', 'required': True, 'schema': {
+            'type': 'object',
+            'required': ['customer', 'items'],
+            'properties': {
+                'customer': {'type': 'string'},
+                'notes': {'type': 'string'},
+                'items': {'type': 'array', 'items': ITEM_SCHEMA},
+            },
+        }},
+    ],
+    'responses': {'200': {'description': 'OK'}},
+}
+
+# string parameters expressed as JSON schema for the generic validator
+# using the same patterns so that both accept the same values
+PATTERNS = {
+    'integer': {'type': 'string',
+                'pattern': validators._INTEGER_RE.pattern},
+    'number': {'type': 'string', 'pattern': validators._NUMBER_RE.pattern},
+    'boolean': {'type': 'string', 'pattern': r'^(?i:true|false)\Z'},
+    'string': {'type': 'string'},
+}
+
+VALID = {
+    'path_args': {'id': '42'},
+    'query_args': {'fields': 'items', 'limit': '10', 'verbose': 'true'},
+    'headers': {'X-Request-Id': 'abc'},
+    'body': {'customer': 'c-1', 'notes': 'leave at the door',
+             'items': [{'sku': 'sku-{}'.format(i), 'quantity': i,
+                        'price': 9.99, 'gift': False}
+                       for i in range(10)]},
+}
+
+INVALID = {
+    'path_args': {'id': 'forty-two'},
+    'query_args': {'limit': '1.5', 'verbose': 'yes'},
+    'headers': {},
+    'body': {'items': [{'sku': 1, 'quantity': '2'}] * 10},
+}
+
+
+def generic_schema(operation):
+    """Express `operation` as a single JSON schema for a request."""
+    schema = {'type': 'object', 'properties': {}, 'required': []}
+    for location in ('path_args', 'query_args', 'headers'):
+        schema['properties'][location] = {
+            'type': 'object', 'properties': {}, 'required': []}
+    locations = {'path': 'path_args', 'query': 'query_args',
+                 'header': 'headers'}
+    for param in operation['parameters']:
+        if param['in'] == 'body':
+            schema['properties']['body'] = param['schema']
+            if param.get('required'):
+                schema['required'].append('body')
+            continue
+        container = schema['properties'][locations[param['in']]]
+        container['properties'][param['name']] = PATTERNS[param['type']]
+        if param.get('required'):
+            container['required'].append(param['name'])
+    return schema
+
+
+def time_calls(function, iterations):
+    """Return the mean time of a call to `function` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    try:
+        import jsonschema
+    except ImportError:
+        sys.exit('the benchmark compares with jsonschema, install it first')
+
+    compiled = validators.compile_operation(OPERATION)
+    generic = jsonschema.Draft4Validator(generic_schema(OPERATION))
+
+    def run_compiled(request):
+        try:
+            compiled(**request)
+        except validators.ValidationError as error:
+            return error.errors
+        return []
+
+    def run_generic(request):
+        return list(generic.iter_errors(request))
+
+    print('{:>10} {:>14} {:>14} {:>8}'.format(
+        'request', 'compiled us', 'jsonschema us', 'ratio'))
+    for name, request in (('valid', VALID), ('invalid', INVALID)):
+        assert bool(run_compiled(request)) == bool(run_generic(request))
+        compiled_us = time_calls(lambda: run_compiled(request),
+                                 args.iterations)
+        generic_us = time_calls(lambda: run_generic(request),
+                                args.iterations)
+        print('{:>10} {:>14.2f} {:>14.2f} {:>7.1f}x'.format(
+            name, compiled_us, generic_us, generic_us / compiled_us))
+
+
+if __name__ == '__main__':
+    main()
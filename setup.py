@@ -31,20 +31,23 @@ setuptools.setup(
     author_email='daveshawley+python@gmail.com',
     packages=['sphinxswagger'],
     install_requires=read_requirements('installation.txt'),
+    python_requires='>=3.5',
     classifiers=[
         'Intended Audience :: Developers',
         'License :: OSI Approved :: BSD License',
         'Operating System :: OS Independent',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3.5',
         'Framework :: Sphinx :: Extension',
     ],
     entry_points={
         'distutils.commands': [
             'swagger = sphinxswagger.command:BuildSwagger',
+            'swagger_aggregate = sphinxswagger.command:AggregateSwagger',
+            'swagger_merge = sphinxswagger.command:MergeSwagger',
+            'swagger_versions = '
+            'sphinxswagger.command:BuildSwaggerVersions',
         ],
     },
 )
@@ -1,3 +1,7 @@
+from sphinxswagger.api import build
+
+__all__ = ['build', 'setup', 'version_info', '__version__']
+
 version_info = (0, 0, 4)
 __version__ = '.'.join(str(v) for v in version_info)
 
@@ -12,12 +16,42 @@ def setup(app):
     :rtype: dict
 
     """
-    from . import builder, writer
+    from . import builder, endpoints, sources, writer
+
+    app.setup_extension('sphinxcontrib.httpdomain')
+    endpoints.locate_endpoint_directives(app)
 
     app.add_builder(builder.SwaggerBuilder)
     app.add_config_value('swagger_file', 'swagger.json', True)
     app.add_config_value('swagger_license', {'name': 'Proprietary'}, True)
     app.add_config_value('swagger_description', '', True)
+    app.add_config_value('swagger_debug_info', True, True)
+    app.add_config_value('swagger_module_file', None, True)
+    app.add_config_value('swagger_route_index_file', None, True)
+    app.add_config_value('swagger_event_stream_file', None, True)
+    app.add_config_value('swagger_size_report', False, True)
+    app.add_config_value('swagger_size_report_file', None, True)
+    app.add_config_value('swagger_size_report_limit', 10, True)
+    app.add_config_value('swagger_lean_build', False, True)
+    app.add_config_value('swagger_lean_excluded_extensions',
+                         builder.LEAN_EXCLUDED_EXTENSIONS, True)
+    app.add_config_value('swagger_build_stats', False, True)
+    # handlers are applied when documents are written and every document
+    # with endpoints is written on each build, so changing them does not
+    # require reading the documents again
+    app.add_config_value('swagger_field_handlers', {}, '')
+    app.add_config_value('swagger_validate', False, True)
+    app.add_config_value('swagger_track_sources', True, 'env')
+    app.add_config_value('swagger_archive_dir', None, True)
+    app.add_config_value('swagger_archive_version', None, True)
+    app.add_config_value('swagger_artifact_file', None, True)
+    app.add_config_value('swagger_shard', None, True)
+    app.connect('builder-inited', sources.track_autotornado_sources)
+    app.connect('env-get-outdated', endpoints.index_missing_docs)
+    app.connect('doctree-read', endpoints.note_endpoints)
+    app.connect('env-purge-doc', endpoints.purge_endpoints)
+    app.connect('env-merge-info', endpoints.merge_endpoints)
     app.connect('build-finished', writer.write_swagger_file)
 
-    return {'version': __version__}
+    # the endpoint lines are stored in the pickled doctrees
+    return {'version': __version__, 'env_version': 1}
@@ -0,0 +1,167 @@
+"""
+Build several Sphinx projects concurrently and merge the results.
+
+This is used by the ``swagger_aggregate`` setup command to produce a
+single gateway document from many independently documented services.
+
+"""
+from concurrent import futures
+import contextlib
+import hashlib
+import os.path
+import re
+import sys
+
+
+class CollisionError(ValueError):
+    """Raised when two projects define the same operation or schema."""
+
+    def __init__(self, collisions):
+        self.collisions = collisions
+        super(CollisionError, self).__init__(
+            'swagger documents collide: {}'.format('; '.join(collisions)))
+
+
+def build_project(config_dir, build_dir, overrides=None):
+    """
+    Build the swagger document for a single Sphinx project.
+
+    :param str config_dir: directory containing the project's *conf.py*
+    :param str build_dir: directory to build in.  The doctrees and
+        environment are kept here so that subsequent builds of the same
+        project are incremental.
+    :param dict overrides: optional configuration overrides
+    :return: the swagger document as a :class:`dict`
+    :rtype: dict
+
+    This function is safe to run in a worker process.  The project is
+    built inside of :func:`isolated_imports` so that a worker can build
+    another project afterwards.
+
+    """
+    from sphinxswagger import api
+
+    with isolated_imports(roots=[config_dir]):
+        return api.build(config_dir, overrides, build_dir=build_dir,
+                         reuse=False)
+
+
+@contextlib.contextmanager
+def isolated_imports(paths=(), roots=()):
+    """
+    Build a project without leaking its code into the process.
+
+    :param paths: directories to add to the front of :data:`sys.path`
+    :param roots: other directories whose modules are forgotten
+
+    When the context exits, :data:`sys.path` is restored and the modules
+    that were imported from `paths`, `roots`, or directories that
+    *conf.py* added to :data:`sys.path` are removed from
+    :data:`sys.modules`.  The docutils directives, roles, and nodes that
+    extensions registered are also discarded.
+
+    """
+    try:
+        from sphinx.util.docutils import docutils_namespace
+    except ImportError:  # sphinx < 1.5
+        docutils_namespace = _null_context
+
+    saved_path, saved_modules = sys.path[:], set(sys.modules)
+    sys.path[:0] = list(paths)
+    try:
+        with docutils_namespace():
+            yield
+    finally:
+        added = set(sys.path) - set(saved_path)
+        sys.path[:] = saved_path
+        prefixes = tuple(os.path.join(os.path.abspath(root), '')
+                         for root in added.union(roots) if root)
+        for name in set(sys.modules) - saved_modules:
+            module_file = getattr(sys.modules[name], '__file__', None)
+            if module_file and os.path.abspath(module_file).startswith(
+                    prefixes):
+                del sys.modules[name]
+
+
+@contextlib.contextmanager
+def _null_context():
+    yield
+
+
+def build_projects(projects, build_dir, jobs=None):
+    """
+    Build many projects concurrently in a process pool.
+
+    :param list projects: sequence of ``(base_path, config_dir)`` pairs
+    :param str build_dir: directory that the per-project build
+        directories are created in
+    :param int jobs: maximum number of worker processes.  This defaults
+        to the number of processors on the machine.
+    :return: list of ``(base_path, document)`` pairs in the same order
+        as `projects`
+    :rtype: list
+
+    """
+    with futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = [
+            executor.submit(build_project, config_dir,
+                            os.path.join(build_dir, _safe_name(base_path)))
+            for base_path, config_dir in projects]
+        return [(base_path, future.result())
+                for (base_path, _), future in zip(projects, pending)]
+
+
+def merge_documents(documents, info):
+    """
+    Merge swagger documents under per-service base paths.
+
+    :param list documents: sequence of ``(base_path, document)`` pairs
+    :param dict info: the ``info`` object for the merged document
+    :return: the merged swagger document
+    :rtype: dict
+    :raises CollisionError: if the same operation or a conflicting
+        definition appears in more than one document
+
+    """
+    paths, definitions, owners, collisions = {}, {}, {}, []
+    for base_path, doc in documents:
+        prefix = '/' + base_path.strip('/') if base_path.strip('/') else ''
+        for path, operations in doc.get('paths', {}).items():
+            merged_path = prefix + path
+            path_info = paths.setdefault(merged_path, {})
+            for method, operation in operations.items():
+                key = '{} {}'.format(method.upper(), merged_path)
+                if method in path_info:
+                    collisions.append('{} in {} and {}'.format(
+                        key, owners[key], base_path))
+                    continue
+                owners[key] = base_path
+                path_info[method] = operation
+
+        for name, schema in doc.get('definitions', {}).items():
+            key = 'definition ' + name
+            if name in definitions and definitions[name] != schema:
+                collisions.append('{} in {} and {}'.format(
+                    key, owners[key], base_path))
+                continue
+            owners.setdefault(key, base_path)
+            definitions[name] = schema
+
+    if collisions:
+        raise CollisionError(collisions)
+
+    merged = {'swagger': '2.0',
+              'info': info,
+              'host': 'localhost:80',
+              'basePath': '/',
+              'paths': paths}
+    if definitions:
+        merged['definitions'] = definitions
+    return merged
+
+
+def _safe_name(name):
+    # the digest keeps names like /a/b and /a_b apart
+    readable = re.sub(r'[^A-Za-z0-9_.-]+', '_', name.strip('/')) or '_root'
+    digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]
+    return '{}-{}'.format(readable, digest)
@@ -0,0 +1,86 @@
+"""
+Programmatic interface for building swagger documents in memory.
+
+:func:`build` runs the ``swagger`` builder and returns the document
+without writing the swagger file.  By default the Sphinx application
+is kept warm between calls so that repeated builds in the same process
+only re-read sources that have changed.
+
+"""
+import atexit
+import os.path
+import shutil
+import sys
+import tempfile
+
+
+_applications = {}
+
+# files that the swagger builder writes besides the swagger file
+_OUTPUT_SETTINGS = ('swagger_archive_dir', 'swagger_artifact_file',
+                    'swagger_event_stream_file', 'swagger_module_file',
+                    'swagger_route_index_file', 'swagger_size_report_file')
+
+
+def build(config_dir, overrides=None, build_dir=None, reuse=True):
+    """
+    Build the swagger document for a Sphinx project.
+
+    :param str config_dir: directory containing the project's *conf.py*
+    :param dict overrides: optional configuration overrides
+    :param str build_dir: directory to keep the build environment in.  A
+        temporary directory is used if this is omitted.
+    :param bool reuse: keep the Sphinx application and environment
+        around for the next call with the same arguments
+    :return: the swagger document as a :class:`dict`
+    :rtype: dict
+
+    The swagger file and the other outputs of the builder -- the
+    archive, module, artifact, route index, event stream, and size
+    report files -- are not written unless `overrides` explicitly sets
+    the corresponding configuration value.
+
+    """
+    overrides = dict(overrides or {})
+    overrides.setdefault('swagger_file', '')
+    for name in _OUTPUT_SETTINGS:
+        overrides.setdefault(name, None)
+    config_dir = os.path.abspath(config_dir)
+    key = (config_dir, build_dir, repr(sorted(overrides.items())))
+
+    if reuse and key in _applications:
+        app, temp_dir = _applications[key]
+    else:
+        app, temp_dir = _create_application(config_dir, overrides, build_dir)
+        if reuse:
+            _applications[key] = app, temp_dir
+            if temp_dir is not None:
+                atexit.register(shutil.rmtree, temp_dir, ignore_errors=True)
+
+    try:
+        app.build()
+        return app.builder.swagger.get_document(app.config)
+    finally:
+        if temp_dir is not None and not reuse:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def reset():
+    """Discard the Sphinx applications kept warm by :func:`build`."""
+    for _, temp_dir in _applications.values():
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    _applications.clear()
+
+
+def _create_application(config_dir, overrides, build_dir):
+    from sphinx import application
+
+    temp_dir = None
+    if build_dir is None:
+        build_dir = temp_dir = tempfile.mkdtemp(prefix='sphinxswagger-')
+    doctree_dir = os.path.join(build_dir, 'doctrees')
+    app = application.Sphinx(config_dir, config_dir, build_dir, doctree_dir,
+                             'swagger', confoverrides=overrides,
+                             status=None, warning=sys.stderr)
+    return app, temp_dir
@@ -0,0 +1,201 @@
+"""
+Content-addressed archive of swagger documents.
+
+Operations and definitions rarely change between versions of an API, so
+the archive stores each of them once, keyed by the SHA-256 of its
+canonical JSON encoding.  A version is a small manifest that contains
+the rest of the document and references to the stored objects::
+
+   root/
+      objects/9f/86d081884c7d659a2feaa0c55ad015...
+      versions/1.2.0.json
+
+Objects are immutable and manifests are replaced atomically, so readers
+never observe a partially written version.
+
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+
+class SwaggerArchive(object):
+    """
+    Stores and retrieves swagger documents by version.
+
+    :param str root: directory that the archive is kept in.  It is
+        created when the first version is stored.
+
+    Objects are cached in memory once they are read so rebuilding
+    several versions from the same instance only reads each shared
+    object from disk once.
+
+    """
+
+    def __init__(self, root):
+        super(SwaggerArchive, self).__init__()
+        self.root = root
+        self._objects = {}
+
+    def store(self, version, swagger):
+        """
+        Add a document to the archive.
+
+        :param str version: the version to store the document as.  An
+            existing version with the same name is replaced.
+        :param dict swagger: the swagger document
+        :return: the manifest that was written
+        :rtype: dict
+
+        """
+        document = {key: value for key, value in swagger.items()
+                    if key not in ('paths', 'definitions')}
+        paths = {
+            path: {method: self._put_object(operation)
+                   for method, operation in path_info.items()}
+            for path, path_info in swagger.get('paths', {}).items()}
+        definitions = {
+            name: self._put_object(schema)
+            for name, schema in swagger.get('definitions', {}).items()}
+
+        manifest = {'document': document, 'paths': paths,
+                    'definitions': definitions}
+        self._write_atomically(self._version_file(version),
+                               _encode(manifest))
+        return manifest
+
+    def versions(self):
+        """
+        List the versions in the archive.
+
+        :rtype: list
+
+        """
+        try:
+            names = os.listdir(os.path.join(self.root, 'versions'))
+        except OSError:
+            return []
+        return sorted(name[:-len('.json')] for name in names
+                      if name.endswith('.json'))
+
+    def manifest(self, version):
+        """
+        Read the manifest for a version.
+
+        :param str version: the version to read
+        :rtype: dict
+        :raises KeyError: if `version` is not in the archive
+
+        """
+        try:
+            with open(self._version_file(version), 'rb') as f:
+                return json.loads(f.read().decode('utf-8'))
+        except (IOError, OSError):
+            raise KeyError(version)
+
+    def load(self, version):
+        """
+        Rebuild the document for a version.
+
+        :param str version: the version to load
+        :return: the swagger document as a :class:`dict` that is equal
+            to the stored document
+        :rtype: dict
+        :raises KeyError: if `version` is not in the archive
+
+        """
+        manifest = self.manifest(version)
+        swagger = dict(manifest['document'])
+        swagger['paths'] = {
+            path: {method: self._get_object(digest)
+                   for method, digest in path_info.items()}
+            for path, path_info in manifest['paths'].items()}
+        if manifest['definitions']:
+            swagger['definitions'] = {
+                name: self._get_object(digest)
+                for name, digest in manifest['definitions'].items()}
+        return swagger
+
+    def get_operation(self, version, path, method):
+        """
+        Read a single operation without rebuilding the document.
+
+        :param str version: the version to read from
+        :param str path: the URI template of the operation
+        :param str method: the HTTP method of the operation
+        :return: the swagger operation object
+        :rtype: dict
+        :raises KeyError: if the version or operation does not exist
+
+        """
+        manifest = self.manifest(version)
+        return self._get_object(manifest['paths'][path][method.lower()])
+
+    def get_definition(self, version, name):
+        """
+        Read a single definition without rebuilding the document.
+
+        :param str version: the version to read from
+        :param str name: the name of the definition
+        :return: the JSON schema of the definition
+        :rtype: dict
+        :raises KeyError: if the version or definition does not exist
+
+        """
+        manifest = self.manifest(version)
+        return self._get_object(manifest['definitions'][name])
+
+    def _put_object(self, value):
+        encoded = _encode(value)
+        digest = hashlib.sha256(encoded).hexdigest()
+        object_file = self._object_file(digest)
+        if not os.path.exists(object_file):
+            self._write_atomically(object_file, encoded)
+        return digest
+
+    def _get_object(self, digest):
+        if digest not in self._objects:
+            with open(self._object_file(digest), 'rb') as f:
+                self._objects[digest] = f.read().decode('utf-8')
+        return json.loads(self._objects[digest])
+
+    def _object_file(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest[2:])
+
+    def _version_file(self, version):
+        check_version(version)
+        return os.path.join(self.root, 'versions', version + '.json')
+
+    @staticmethod
+    def _write_atomically(file_name, data):
+        directory = os.path.dirname(file_name)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(temp_name, 0o644)
+            os.replace(temp_name, file_name)
+        except Exception:
+            os.unlink(temp_name)
+            raise
+
+
+def check_version(version):
+    """
+    Ensure that `version` can name a version in an archive.
+
+    :param str version: the version to check
+    :raises ValueError: if `version` is empty or is not a plain file
+        name
+
+    """
+    if (not version or version.startswith('.') or
+            '/' in version or os.sep in version):
+        raise ValueError('invalid version {!r}'.format(version))
+
+
+def _encode(value):
+    return json.dumps(value, sort_keys=True,
+                      separators=(',', ':')).encode('utf-8')
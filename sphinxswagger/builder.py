@@ -1,8 +1,17 @@
 import docutils.io
+import os.path
 
-from sphinx import builders
+from sphinx import addnodes, builders, errors
 
-from . import document, writer
+from . import diagnostics, document, sharding, writer
+
+
+LEAN_EXCLUDED_EXTENSIONS = [
+    'sphinx.ext.githubpages',
+    'sphinx.ext.intersphinx',
+    'sphinx.ext.todo',
+    'sphinx.ext.viewcode',
+]
 
 
 class SwaggerBuilder(builders.Builder):
@@ -12,24 +21,89 @@ class SwaggerBuilder(builders.Builder):
     def init(self):
         """Sub-class hook called from __init__"""
         self.writer = None
+        self.event_stream = None
+        self.stats = None
+        self.field_handlers = writer.load_field_handlers(
+            self.config.swagger_field_handlers)
+        self.shard = None
+        if self.config.swagger_shard:
+            try:
+                self.shard = sharding.parse_shard(self.config.swagger_shard)
+            except ValueError as error:
+                raise errors.ConfigError(str(error))
+        if self.config.swagger_archive_dir:
+            from sphinxswagger import archive
+            version = (self.config.swagger_archive_version or
+                       self.config.version)
+            try:
+                archive.check_version(version)
+            except ValueError as error:
+                raise errors.ConfigError(
+                    'cannot archive the build: {}, set '
+                    'swagger_archive_version or version'.format(error))
+
+    def write(self, build_docnames, updated_docnames, method='update'):
+        """
+        Write the documents that contain HTTP endpoints.
+
+        Only the documents in ``swagger_shard`` are written when it is
+        set.
+
+        """
+        endpoint_docs = getattr(self.env, 'swagger_endpoint_docs', {})
+        docnames = sorted(
+            docname for docname in self.env.all_docs
+            if docname in endpoint_docs and
+            (self.shard is None or sharding.in_shard(docname, self.shard)))
+        diagnostics.log_info(
+            self.app, 'translating {} of {} documents that contain '
+            'endpoints'.format(len(docnames), len(self.env.all_docs)))
+        if self.config.swagger_event_stream_file:
+            self.event_stream = open(
+                os.path.join(self.outdir,
+                             self.config.swagger_event_stream_file), 'w')
+        try:
+            self.prepare_writing(set(docnames))
+            for docname in docnames:
+                # tables of contents do not contribute to the swagger
+                # document so they are not resolved
+                doctree = self.env.get_doctree(docname)
+                for node in doctree.traverse(addnodes.toctree):
+                    node.replace_self([])
+                self.write_doc(docname, self.env.get_and_resolve_doctree(
+                    docname, self, doctree))
+        finally:
+            if self.event_stream is not None:
+                self.event_stream.close()
+                self.event_stream = None
 
     def prepare_writing(self, docnames):
         """Called before :meth:`write_doc`"""
-        self.swagger = document.SwaggerDocument()
-        self.writer = writer.SwaggerWriter(swagger_document=self.swagger)
+        self.stats = diagnostics.BuildStats(
+            enabled=self.config.swagger_build_stats or self.app.verbosity > 1)
+        self.swagger = document.SwaggerDocument(
+            event_stream=self.event_stream)
+        self.writer = writer.SwaggerWriter(
+            swagger_document=self.swagger, verbosity=self.app.verbosity,
+            stats=self.stats, field_handlers=self.field_handlers,
+            debug_info=self.config.swagger_debug_info)
 
     def write_doc(self, docname, doctree):
         """Write a doc to the filesystem."""
         destination = docutils.io.NullOutput()
+        self.writer.docname = docname
         self.writer.write(doctree, destination)
 
     def get_outdated_docs(self):
         """List of docs that we need to write or just a file name."""
-        return self.app.config.swagger_file
+        return self.app.config.swagger_file or 'swagger document'
 
     def get_target_uri(self, docname, typ=None):
         return ''  # No clue what to return here :/
 
     def finish(self):
         """Called after write() has completed."""
-        pass
+        if self.stats is not None and self.stats.enabled:
+            diagnostics.log_info(self.app, 'swagger build statistics:')
+            for line in self.stats.format_report():
+                diagnostics.log_info(self.app, '    ' + line)
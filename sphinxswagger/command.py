@@ -1,8 +1,7 @@
-from distutils import cmd, log
+from distutils import cmd, errors, log
+import json
 import os.path
 
-from sphinx import application
-
 
 class BuildSwagger(cmd.Command):
     description = 'Build a swagger definition from Sphinx docs'
@@ -10,13 +9,17 @@ class BuildSwagger(cmd.Command):
         ('config-dir=', 'c', 'configuration directory'),
         ('output-file=', 'o', 'output file name'),
         ('ignore-distinfo', 'u', 'ignore distribution metadata'),
+        ('lean', 'l', 'skip extensions that do not affect the output'),
+        ('shard=', 's', 'only translate shard index/count of the documents'),
     ]
-    boolean_options = ['ignore-distinfo']
+    boolean_options = ['ignore-distinfo', 'lean']
 
     def initialize_options(self):
         self.config_dir = None
         self.output_file = None
         self.ignore_distinfo = False
+        self.lean = False
+        self.shard = None
 
     def finalize_options(self):
         if self.config_dir is None:
@@ -31,7 +34,16 @@ class BuildSwagger(cmd.Command):
         if self.output_file is not None:
             self.output_file = os.path.abspath(self.output_file)
 
+        if self.shard is not None:
+            from sphinxswagger import sharding
+            try:
+                sharding.parse_shard(self.shard)
+            except ValueError as error:
+                raise errors.DistutilsOptionError(str(error))
+
     def run(self):
+        from sphinx import application
+
         build_cmd = self.get_finalized_command('build')
         build_dir = os.path.join(os.path.abspath(build_cmd.build_base),
                                  'swagger')
@@ -53,11 +65,51 @@ class BuildSwagger(cmd.Command):
             if self.distribution.get_version():
                 overrides['version'] = self.distribution.get_version()
 
+        if self.shard is not None:
+            overrides['swagger_shard'] = self.shard
+
+        overrides.update(self._get_lean_overrides())
+
         app = application.Sphinx(
             self.config_dir, self.config_dir, build_dir, doctree_dir,
             'swagger', confoverrides=overrides)
         app.build()
 
+    def _get_lean_overrides(self):
+        """
+        Generate the configuration overrides for a lean build.
+
+        :return: :class:`dict` of configuration overrides that remove
+            the extensions listed in ``swagger_lean_excluded_extensions``
+            and disable intersphinx inventory fetching if the ``lean``
+            option or the ``swagger_lean_build`` configuration value is
+            set.  Otherwise an empty :class:`dict` is returned.
+        :rtype: dict
+
+        The configuration is read separately so that the regular HTML
+        build is not affected.
+
+        """
+        from sphinxswagger import builder
+
+        project_config = _read_config(self.config_dir)
+        raw_config = project_config._raw_config
+        if not (self.lean or raw_config.get('swagger_lean_build')):
+            return {}
+
+        excluded = raw_config.get('swagger_lean_excluded_extensions',
+                                  builder.LEAN_EXCLUDED_EXTENSIONS)
+        extensions = [ext for ext in project_config.extensions
+                      if ext not in excluded]
+        self.info('lean build, excluding extensions {}',
+                  ', '.join(ext for ext in project_config.extensions
+                            if ext in excluded) or 'none')
+
+        overrides = {'extensions': extensions}
+        if 'sphinx.ext.intersphinx' in extensions:
+            overrides['intersphinx_mapping'] = {}
+        return overrides
+
     def warning(self, msg, *args):
         self.announce(msg.format(*args), level=log.WARNING)
 
@@ -66,3 +118,249 @@ class BuildSwagger(cmd.Command):
 
     def debug(self, msg, *args):
         self.announce(msg.format(*args), level=log.DEBUG)
+
+
+class AggregateSwagger(cmd.Command):
+    description = 'Build and merge swagger definitions from many projects'
+    user_options = [
+        ('projects=', 'p',
+         'base-path=config-dir pairs, one per line or separated by '
+         'whitespace'),
+        ('output-file=', 'o', 'output file name'),
+        ('jobs=', 'j', 'number of projects to build concurrently'),
+    ]
+
+    def initialize_options(self):
+        self.projects = None
+        self.output_file = None
+        self.jobs = None
+
+    def finalize_options(self):
+        if not self.projects:
+            raise errors.DistutilsOptionError('projects must be specified')
+        # a multi-line value holds one project per line which allows
+        # configuration directories that contain spaces
+        specs = (self.projects.splitlines() if '\n' in self.projects
+                 else self.projects.split())
+        projects = []
+        for spec in filter(None, (spec.strip() for spec in specs)):
+            base_path, sep, config_dir = spec.partition('=')
+            if not sep or not config_dir:
+                raise errors.DistutilsOptionError(
+                    'malformed project specification {!r}, expected '
+                    'base-path=config-dir'.format(spec))
+            # each base path has its own build directory so two projects
+            # with the same base path would be built in the same place
+            if base_path in (existing for existing, _ in projects):
+                raise errors.DistutilsOptionError(
+                    'base path {!r} is used by more than one '
+                    'project'.format(base_path))
+            projects.append((base_path, os.path.abspath(config_dir)))
+        self.projects = projects
+
+        if self.output_file is None:
+            self.output_file = 'swagger.json'
+        self.output_file = os.path.abspath(self.output_file)
+
+        if self.jobs is not None:
+            self.jobs = int(self.jobs)
+
+    def run(self):
+        from sphinxswagger import aggregate
+
+        build_cmd = self.get_finalized_command('build')
+        build_dir = os.path.join(os.path.abspath(build_cmd.build_base),
+                                 'swagger-aggregate')
+        self.mkpath(build_dir)
+
+        self.info('building {} projects', len(self.projects))
+        documents = aggregate.build_projects(self.projects, build_dir,
+                                             jobs=self.jobs)
+
+        info = {'title': self.distribution.get_name(),
+                'description': self.distribution.get_description(),
+                'version': self.distribution.get_version()}
+        if self.distribution.get_license():
+            info['license'] = {'name': self.distribution.get_license()}
+        try:
+            merged = aggregate.merge_documents(documents, info)
+        except aggregate.CollisionError as error:
+            raise errors.DistutilsExecError(str(error))
+
+        self.mkpath(os.path.dirname(self.output_file))
+        with open(self.output_file, 'w') as f:
+            json.dump(merged, f, indent=2)
+
+    def info(self, msg, *args):
+        self.announce(msg.format(*args), level=log.INFO)
+
+
+class MergeSwagger(cmd.Command):
+    description = 'Merge the fragments of a sharded swagger build'
+    user_options = [
+        ('config-dir=', 'c', 'configuration directory'),
+        ('fragments=', 'f',
+         'whitespace-separated list of fragment files or glob patterns'),
+        ('output-file=', 'o', 'output file name'),
+    ]
+
+    def initialize_options(self):
+        self.config_dir = None
+        self.fragments = None
+        self.output_file = None
+
+    def finalize_options(self):
+        import glob
+
+        if self.config_dir is None:
+            self.config_dir = 'docs'
+        self.ensure_dirname('config_dir')
+        self.config_dir = os.path.abspath(self.config_dir)
+
+        if not self.fragments:
+            build_cmd = self.get_finalized_command('build')
+            self.fragments = os.path.join(build_cmd.build_base, 'swagger',
+                                          '*.shard-*-of-*.json')
+        fragments = []
+        for pattern in self.fragments.split():
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise errors.DistutilsOptionError(
+                    'no fragments match {!r}'.format(pattern))
+            fragments.extend(matches)
+        self.fragments = [os.path.abspath(name) for name in fragments]
+
+        if self.output_file is None:
+            self.output_file = 'swagger.json'
+        self.output_file = os.path.abspath(self.output_file)
+
+    def run(self):
+        from sphinx import application
+
+        from sphinxswagger import builder, sharding, writer
+
+        decoded = []
+        for file_name in self.fragments:
+            self.info('reading {}', file_name)
+            with open(file_name) as f:
+                decoded.append(json.load(f))
+        try:
+            merged = sharding.merge_fragments(decoded)
+        except ValueError as error:
+            raise errors.DistutilsExecError(str(error))
+
+        # the project configuration selects the other outputs which are
+        # written next to the merged document.  Nothing is read so the
+        # extensions that a lean build skips are not loaded either.
+        build_cmd = self.get_finalized_command('build')
+        doctree_dir = os.path.join(os.path.abspath(build_cmd.build_base),
+                                   'swagger-merge', 'doctrees')
+        self.mkpath(doctree_dir)
+        output_dir = os.path.dirname(self.output_file)
+        self.mkpath(output_dir)
+        app = application.Sphinx(
+            self.config_dir, self.config_dir, output_dir, doctree_dir,
+            'swagger', confoverrides={
+                'swagger_file': os.path.basename(self.output_file),
+                'extensions': [
+                    ext for ext in _read_config(self.config_dir).extensions
+                    if ext not in builder.LEAN_EXCLUDED_EXTENSIONS]})
+        sources = sharding.fragment_sources(decoded)
+        writer.write_swagger_outputs(
+            app, merged,
+            lambda path, method: sources.get((path, method), (None, None)))
+
+    def info(self, msg, *args):
+        self.announce(msg.format(*args), level=log.INFO)
+
+
+class BuildSwaggerVersions(cmd.Command):
+    description = 'Build swagger definitions for several git refs'
+    user_options = [
+        ('refs=', 'r', 'whitespace-separated list of git refs to build'),
+        ('config-dir=', 'c',
+         'configuration directory relative to the project directory'),
+        ('python-path=', 'p',
+         'whitespace-separated list of importable directories relative '
+         'to the project directory'),
+        ('output-dir=', 'o', 'directory to write the definitions to'),
+        ('jobs=', 'j', 'number of refs to build concurrently'),
+    ]
+
+    def initialize_options(self):
+        self.refs = None
+        self.config_dir = None
+        self.python_path = None
+        self.output_dir = None
+        self.jobs = None
+
+    def finalize_options(self):
+        from sphinxswagger import versions
+
+        if not self.refs:
+            raise errors.DistutilsOptionError('refs must be specified')
+        self.refs = self.refs.split()
+        names = {}
+        for ref in self.refs:
+            other = names.setdefault(versions.output_name(ref), ref)
+            if other != ref:
+                raise errors.DistutilsOptionError(
+                    'refs {!r} and {!r} would both be written to {}'.format(
+                        other, ref, versions.output_name(ref)))
+
+        if self.config_dir is None:
+            self.config_dir = 'docs'
+        self.python_path = (self.python_path or '.').split()
+
+        build_cmd = self.get_finalized_command('build')
+        if self.output_dir is None:
+            self.output_dir = os.path.join(build_cmd.build_base,
+                                           'swagger-versions')
+        self.output_dir = os.path.abspath(self.output_dir)
+
+        if self.jobs is not None:
+            self.jobs = int(self.jobs)
+
+    def run(self):
+        from sphinxswagger import versions
+
+        build_cmd = self.get_finalized_command('build')
+        build_dir = os.path.join(os.path.abspath(build_cmd.build_base),
+                                 'swagger-trees')
+        self.mkpath(build_dir)
+        self.mkpath(self.output_dir)
+
+        self.info('building {} refs', len(self.refs))
+        try:
+            documents = versions.build_versions(
+                os.path.abspath(os.curdir), self.refs, build_dir,
+                config_dir=self.config_dir, python_path=self.python_path,
+                jobs=self.jobs)
+        except ValueError as error:
+            raise errors.DistutilsExecError(str(error))
+
+        for ref, swagger in documents:
+            output_file = os.path.join(self.output_dir,
+                                       versions.output_name(ref))
+            self.info('writing {}', output_file)
+            with open(output_file, 'w') as f:
+                json.dump(swagger, f, indent=2)
+
+    def info(self, msg, *args):
+        self.announce(msg.format(*args), level=log.INFO)
+
+
+def _read_config(config_dir):
+    """
+    Read the Sphinx configuration of a project without building it.
+
+    :param str config_dir: directory that contains *conf.py*
+    :rtype: sphinx.config.Config
+
+    """
+    from sphinx import config
+    from sphinx.util import tags
+
+    if hasattr(config.Config, 'read'):  # Sphinx >= 1.8
+        return config.Config.read(config_dir, {}, tags.Tags())
+    return config.Config(config_dir, 'conf.py', {}, tags.Tags())
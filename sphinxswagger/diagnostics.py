@@ -0,0 +1,133 @@
+"""
+Build statistics that cost nothing unless they are enabled.
+
+A disabled :class:`BuildStats` instance ignores every call so the
+translator can be instrumented without slowing down normal builds.
+
+"""
+import time
+
+
+def log_info(app, message):
+    """
+    Log an informational message from the build.
+
+    :param sphinx.application.Sphinx app: the running application
+    :param str message: the message to log
+
+    :mod:`sphinx.util.logging` is used when it is available (Sphinx 1.6
+    and newer) since :meth:`~sphinx.application.Sphinx.info` is
+    deprecated there.
+
+    """
+    try:
+        from sphinx.util import logging
+    except ImportError:
+        app.info(message)
+    else:
+        logging.getLogger(__name__).info(message)
+
+
+def log_warning(app, message, docname=None, line=None):
+    """
+    Log a warning about a location in the documentation.
+
+    :param sphinx.application.Sphinx app: the running application
+    :param str message: the message to log
+    :param str docname: optional name of the document to blame
+    :param int line: optional line number within `docname`
+
+    """
+    try:
+        from sphinx.util import logging
+    except ImportError:
+        location = None
+        if docname is not None:
+            location = app.env.doc2path(docname)
+            if line is not None:
+                location = '{}:{}'.format(location, line)
+        app.warn(message, location)
+    else:
+        location = (docname, line) if docname is not None else None
+        logging.getLogger(__name__).warning(message, location=location)
+
+
+class BuildStats(object):
+    """
+    Collects counters and timings while documents are translated.
+
+    :param bool enabled: should anything be recorded?
+
+    """
+
+    def __init__(self, enabled=False):
+        super(BuildStats, self).__init__()
+        self.enabled = enabled
+        self.counters = {}
+        self.timings = {}
+
+    def increment(self, name, count=1):
+        """Add `count` to the counter named `name`."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + count
+
+    def timed(self, name):
+        """
+        Time a block of code.
+
+        :param str name: name to accumulate the elapsed time under
+        :return: a context manager that records the time spent in
+            the ``with`` block and increments the counter of the same
+            name
+
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def format_report(self):
+        """
+        Render the collected statistics.
+
+        :return: the formatted lines sorted by name
+        :rtype: list
+
+        """
+        lines = []
+        for name in sorted(set(self.counters) | set(self.timings)):
+            if name in self.timings:
+                lines.append('{:<40} {:>8} {:>10.3f}s'.format(
+                    name, self.counters.get(name, 0), self.timings[name]))
+            else:
+                lines.append('{:<40} {:>8}'.format(name, self.counters[name]))
+        return lines
+
+
+class _Timer(object):
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *exc_info):
+        timings = self.stats.timings
+        timings[self.name] = (timings.get(self.name, 0.0) +
+                              time.time() - self.start)
+        self.stats.increment(self.name)
+
+
+class _NullTimer(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
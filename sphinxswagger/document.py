@@ -1,14 +1,22 @@
-try:
-    import http.client as http_client
-except ImportError:
-    import httplib as http_client
+import http.client
+import json
 
 
 class SwaggerDocument(object):
+    """
+    Accumulates endpoints into a swagger document.
 
-    def __init__(self):
+    :param event_stream: optional file-like object that receives a
+        newline-delimited JSON record for each endpoint as it is added
+
+    """
+
+    def __init__(self, event_stream=None):
         super(SwaggerDocument, self).__init__()
         self._paths = {}
+        self._sources = {}
+        self._operations = []
+        self._event_stream = event_stream
 
     def get_document(self, config):
         """
@@ -29,13 +37,33 @@ class SwaggerDocument(object):
                 'basePath': '/',
                 'paths': self._paths}
 
-    def add_endpoint(self, endpoint, debug_info=None):
+    def get_fragment(self, config, shard):
+        """
+        :param sphinx.config.Config config: project level configuration
+        :param tuple shard: ``(index, count)`` tuple of the shard that
+            was built
+        :return: the fragment of a sharded build as a :class:`dict` that
+            can be combined with
+            :func:`sphinxswagger.sharding.merge_fragments`
+        :rtype: dict
+        """
+        document = self.get_document(config)
+        document['paths'] = {}
+        return {'shard': list(shard),
+                'document': document,
+                'operations': self._operations}
+
+    def add_endpoint(self, endpoint, debug_info=None, docname=None,
+                     line=None):
         """
         Add a swagger endpoint document.
 
         :param SwaggerEndpoint endpoint: the endpoint to add
         :param dict debug_info: optional debug information to include
             in the swagger definition
+        :param str docname: name of the document that the endpoint
+            was defined in
+        :param int line: line number that the endpoint was defined on
 
         """
         path_info = self._paths.setdefault(endpoint.uri_template, {})
@@ -44,6 +72,37 @@ class SwaggerDocument(object):
         path_info[endpoint.method] = endpoint.generate_swagger()
         if debug_info:
             path_info[endpoint.method]['x-debug-info'] = debug_info
+        self._sources[endpoint.uri_template, endpoint.method] = (docname,
+                                                                 line)
+        self._operations.append({'docname': docname,
+                                 'line': line,
+                                 'path': endpoint.uri_template,
+                                 'method': endpoint.method,
+                                 'operation': path_info[endpoint.method]})
+
+        if self._event_stream is not None:
+            self._event_stream.write(json.dumps({
+                'path': endpoint.uri_template,
+                'method': endpoint.method,
+                'docname': docname,
+                'line': line,
+                'operation': path_info[endpoint.method],
+            }))
+            self._event_stream.write('\n')
+            self._event_stream.flush()
+
+    def get_source(self, uri_template, method):
+        """
+        Retrieve where an endpoint was defined.
+
+        :param str uri_template: the endpoint's URI template
+        :param str method: the endpoint's HTTP method
+        :return: ``(docname, line)`` tuple.  Either element may be
+            :data:`None` if it is unknown.
+        :rtype: tuple
+
+        """
+        return self._sources.get((uri_template, method), (None, None))
 
 
 class SwaggerEndpoint(object):
@@ -57,6 +116,7 @@ class SwaggerEndpoint(object):
         self.responses = {}
         self.default_response_schema = None
         self.response_headers = None
+        self.operation_fields = {}
 
     def set_default_response_structure(self, properties, is_array=False):
         schema = {'type': 'object', 'properties': {}, 'required': []}
@@ -89,7 +149,7 @@ class SwaggerEndpoint(object):
             if not info['reason']:
                 try:
                     code = int(code)
-                    info['reason'] = http_client.responses[code]
+                    info['reason'] = http.client.responses[code]
                 except (KeyError, TypeError, ValueError):
                     info['reason'] = 'Unknown'
 
@@ -101,6 +161,7 @@ class SwaggerEndpoint(object):
 
     def generate_swagger(self):
         swagger = {'summary': self.summary, 'description': self.description}
+        swagger.update(self.operation_fields)
         if self.parameters:
             swagger['parameters'] = self.parameters
 
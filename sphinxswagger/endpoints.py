@@ -0,0 +1,128 @@
+"""
+Locate the HTTP endpoints in a document.
+
+The swagger builder only cares about ``desc`` nodes from the ``http``
+domain.  Narrative documents usually contain a few of them among many
+sections, tables, and code blocks, so instead of dispatching every node
+through the translator the builder:
+
+* counts the endpoints in each document when it is read and skips the
+  documents that do not contain any when writing
+* searches the documents that do contain endpoints without descending
+  into text elements, which is where most of the nodes in a document are
+
+The ``http`` domain directives do not record where they appear, so the
+``desc`` nodes would only report the line of the enclosing section.
+:func:`locate_endpoint_directives` wraps them so that every endpoint
+carries the source and line of its own directive.
+
+"""
+from docutils import nodes
+from sphinx import addnodes
+
+
+def find_endpoint_nodes(node):
+    """
+    Find the top-most HTTP ``desc`` nodes below `node`.
+
+    :param docutils.nodes.Node node: the node to search
+    :return: iterator of :class:`sphinx.addnodes.desc` nodes in document
+        order
+
+    Other ``desc`` nodes are not searched since the translator skips
+    endpoints that are nested in them.
+
+    """
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, addnodes.desc):
+            if current.get('domain') == 'http':
+                yield current
+        elif (isinstance(current, nodes.Element) and
+              not isinstance(current, nodes.TextElement)):
+            pending.extend(reversed(current.children))
+
+
+def locate_endpoint_directives(app):
+    """
+    Replace the ``http`` domain directives with ones that note their line.
+
+    :param sphinx.application.Sphinx app: the running application
+
+    This is called from :func:`sphinxswagger.setup` since the domain
+    directives have to be replaced before the build environment creates
+    the domains.
+
+    """
+    from sphinxcontrib import httpdomain
+
+    for name, directive in sorted(httpdomain.HTTPDomain.directives.items()):
+        app.add_directive_to_domain('http', name,
+                                    _located_directive(directive))
+
+
+def _located_directive(base):
+    class LocatedDirective(base):
+        """Sets the source and line of the ``desc`` nodes it creates."""
+
+        def run(self):
+            result = base.run(self)
+            source, line = self.state_machine.get_source_and_line(
+                self.lineno)
+            for node in result:
+                if isinstance(node, addnodes.desc):
+                    node.source, node.line = source, line
+            return result
+
+    LocatedDirective.__name__ = base.__name__
+    return LocatedDirective
+
+
+def note_endpoints(app, doctree):
+    """
+    Record the number of endpoints in a document that was just read.
+
+    :param sphinx.application.Sphinx app:
+    :param docutils.nodes.document doctree:
+
+    """
+    env = app.env
+    if not hasattr(env, 'swagger_endpoint_docs'):
+        env.swagger_endpoint_docs = {}
+    count = sum(1 for _ in find_endpoint_nodes(doctree))
+    if count:
+        env.swagger_endpoint_docs[env.docname] = count
+    else:
+        env.swagger_endpoint_docs.pop(env.docname, None)
+
+
+def purge_endpoints(app, env, docname):
+    """Forget the endpoints of a document that is removed or re-read."""
+    if hasattr(env, 'swagger_endpoint_docs'):
+        env.swagger_endpoint_docs.pop(docname, None)
+
+
+def merge_endpoints(app, env, docnames, other):
+    """Merge the endpoints recorded by a parallel reader."""
+    if not hasattr(env, 'swagger_endpoint_docs'):
+        env.swagger_endpoint_docs = {}
+    recorded = getattr(other, 'swagger_endpoint_docs', {})
+    for docname in docnames:
+        if docname in recorded:
+            env.swagger_endpoint_docs[docname] = recorded[docname]
+
+
+def index_missing_docs(app, env, added, changed, removed):
+    """
+    Re-read every document if the environment predates the index.
+
+    :return: the names of the documents to read again
+    :rtype: list
+
+    """
+    env = getattr(env, 'env', env)  # sphinx 1.x passes the builder
+    if hasattr(env, 'swagger_endpoint_docs'):
+        return []
+    env.swagger_endpoint_docs = {}
+    return list(env.found_docs - set(added))
@@ -0,0 +1,222 @@
+"""
+Mock HTTP server generated from a swagger document.
+
+Every response is rendered into bytes when the server starts and the
+request path is matched with a :class:`~sphinxswagger.routing.RouteIndex`
+so the server does very little work per request::
+
+   $ python -m sphinxswagger.mock build/swagger/swagger.json --port 8000
+
+The response for an operation uses the first successful status code
+that is documented for it, the documented response headers, and a body
+that is synthesized from the documented response schema.
+
+"""
+import argparse
+import asyncio
+import http.client
+import json
+
+from sphinxswagger import routing
+
+
+_SAMPLE_VALUES = {
+    'string': 'string',
+    'number': 0,
+    'integer': 0,
+    'boolean': False,
+    'null': None,
+}
+
+
+def synthesize(schema):
+    """
+    Generate a sample value that matches a schema.
+
+    :param dict schema: the JSON schema to generate a value for
+    :return: a value that can be serialized as JSON
+
+    """
+    schema_type = schema.get('type', 'object')
+    if schema_type == 'array':
+        return [synthesize(schema.get('items', {}))]
+    if schema_type == 'object':
+        return {name: synthesize(prop)
+                for name, prop in schema.get('properties', {}).items()}
+    return _SAMPLE_VALUES.get(schema_type)
+
+
+def render_response(status, headers=None, body=b''):
+    """
+    Render a complete HTTP/1.1 response.
+
+    :param int status: the HTTP status code
+    :param dict headers: optional response headers
+    :param bytes body: the response body
+    :return: the head of the response and the body as a tuple of
+        :class:`bytes` so that ``HEAD`` requests can omit the body
+    :rtype: tuple
+
+    """
+    lines = ['HTTP/1.1 {} {}'.format(status,
+                                     http.client.responses.get(status, ''))]
+    for name, value in sorted((headers or {}).items()):
+        lines.append('{}: {}'.format(name, value))
+    lines.append('Content-Length: {}'.format(len(body)))
+    head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+    return head, body
+
+
+def render_operation(operation):
+    """
+    Render the canned response for a swagger operation.
+
+    :param dict operation: the swagger operation
+    :return: the rendered response as returned by :func:`render_response`
+    :rtype: tuple
+
+    """
+    responses = operation.get('responses', {})
+    codes = sorted(int(code) for code in responses if code.isdigit())
+    success = [code for code in codes if 200 <= code < 400]
+    status = success[0] if success else 200
+    response = responses.get(str(status)) or responses.get('default') or {}
+
+    headers = {name: synthesize(header)
+               for name, header in response.get('headers', {}).items()}
+    body = b''
+    if 'schema' in response and status not in (204, 304):
+        headers['Content-Type'] = 'application/json; charset=UTF-8'
+        body = json.dumps(synthesize(response['schema'])).encode('utf-8')
+    return render_response(status, headers, body)
+
+
+def allowed_methods(path_info):
+    """
+    Generate the ``Allow`` header for a path.
+
+    :param dict path_info: the swagger path item
+    :return: the allowed methods separated by commas.  ``HEAD`` is
+        included when the path has a ``GET`` operation since the server
+        answers ``HEAD`` requests with it.
+    :rtype: str
+
+    """
+    methods = set(method.upper() for method in path_info)
+    if 'GET' in methods:
+        methods.add('HEAD')
+    return ', '.join(sorted(methods))
+
+
+class MockServer(object):
+    """
+    Serves canned responses for the operations in a swagger document.
+
+    :param dict swagger: the swagger document
+
+    """
+
+    def __init__(self, swagger):
+        super(MockServer, self).__init__()
+        self.index = routing.RouteIndex.from_document(swagger)
+        self.responses = {
+            (path, method.upper()): render_operation(operation)
+            for path, path_info in swagger.get('paths', {}).items()
+            for method, operation in path_info.items()}
+        self.not_found = render_response(404)
+        self.not_allowed = {
+            path: render_response(405, {'Allow': allowed_methods(path_info)})
+            for path, path_info in swagger.get('paths', {}).items()}
+
+    @classmethod
+    def load(cls, file_name):
+        """Create a server for the swagger document in `file_name`."""
+        with open(file_name) as f:
+            return cls(json.load(f))
+
+    def lookup(self, method, path):
+        """
+        Find the rendered response for a request.
+
+        :param str method: the HTTP method
+        :param str path: the request path which may include a query
+        :return: the rendered response as returned by
+            :func:`render_response`
+        :rtype: tuple
+
+        """
+        match = self.index.match(path.partition('?')[0])
+        if match is None:
+            return self.not_found
+        template = match[0]
+        response = self.responses.get((template, method))
+        if response is None and method == 'HEAD':
+            response = self.responses.get((template, 'GET'))
+        return response or self.not_allowed[template]
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on a connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode(
+                    'latin-1').split()
+                keep_alive = version == 'HTTP/1.1'
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    name, value = name.strip().lower(), value.strip().lower()
+                    if name == 'content-length':
+                        length = int(value)
+                    elif name == 'connection':
+                        keep_alive = value == 'keep-alive'
+                if length:
+                    await reader.readexactly(length)
+
+                head, body = self.lookup(method, path)
+                writer.write(head)
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def serve(self, host='127.0.0.1', port=8000):
+        """Run the server until it is interrupted."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        server = loop.run_until_complete(
+            asyncio.start_server(self.handle_connection, host, port))
+        try:
+            loop.run_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve canned responses from a swagger document.')
+    parser.add_argument('swagger_file', help='swagger document to serve')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='address to listen on')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='port to listen on')
+    args = parser.parse_args()
+    MockServer.load(args.swagger_file).serve(args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
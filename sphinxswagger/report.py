@@ -0,0 +1,169 @@
+"""
+Size accounting for generated swagger documents.
+
+:func:`size_report` breaks the serialized document down by path,
+operation, and section so that you can find out which parts of the
+API documentation drive the size of the output.
+
+"""
+import json
+
+
+SECTIONS = ('parameters', 'responses', 'schemas', 'descriptions',
+            'x-debug-info', 'other', 'unattributed')
+
+# nesting depth of the members of an operation in the swagger file --
+# document, paths, path, operation
+OPERATION_DEPTH = 4
+
+
+def size_report(swagger, top=10):
+    """
+    Account for the serialized size of a swagger document.
+
+    :param dict swagger: the swagger document
+    :param int top: number of the heaviest operations to include
+    :return: JSON-serializable :class:`dict` containing the ``total``
+        size, the size of each ``section`` along with the fraction of
+        it that is ``duplicated``, the size of each path in ``paths``,
+        and the ``top`` heaviest ``operations``
+    :rtype: dict
+
+    Sizes are the number of bytes that each element occupies in the
+    swagger file including the indentation at the depth that it is
+    nested at.  The ``unattributed`` section is whatever is left over
+    -- the document information, path keys, brackets, and separators --
+    so the sections add up to the ``total``.
+
+    """
+    sections = dict.fromkeys(SECTIONS, 0)
+    pieces = {section: [] for section in SECTIONS}
+    paths, operations = {}, []
+
+    for path, path_info in swagger.get('paths', {}).items():
+        paths[path] = _member_size(path, path_info, 2)
+        for method, operation in path_info.items():
+            op_sections = _operation_sections(operation, pieces)
+            for section, size in op_sections.items():
+                sections[section] += size
+            operations.append({'path': path,
+                               'method': method,
+                               'size': _member_size(method, operation, 3),
+                               'sections': op_sections})
+
+    total = _size(swagger)
+    sections['unattributed'] = total - sum(sections.values())
+    operations.sort(key=lambda op: op['size'], reverse=True)
+    return {
+        'total': total,
+        'sections': {
+            section: {'size': sections[section],
+                      'duplicated': _duplication_ratio(pieces[section])}
+            for section in SECTIONS},
+        'paths': paths,
+        'operations': operations[:top],
+    }
+
+
+def format_size_report(report):
+    """
+    Render a size report as a list of table rows.
+
+    :param dict report: the report generated by :func:`size_report`
+    :return: the formatted lines
+    :rtype: list
+
+    """
+    total = report['total'] or 1
+    lines = ['{:<14} {:>10} {:>7} {:>11}'.format('section', 'bytes', 'share',
+                                                 'duplicated')]
+    for section, info in sorted(report['sections'].items(),
+                                key=lambda item: item[1]['size'],
+                                reverse=True):
+        lines.append('{:<14} {:>10} {:>6.1%} {:>10.1%}'.format(
+            section, info['size'], info['size'] / float(total),
+            info['duplicated']))
+    lines.append('{:<14} {:>10}'.format('total', report['total']))
+    lines.append('')
+    lines.append('{:>10} {:<7} {}'.format('bytes', 'method', 'path'))
+    for op in report['operations']:
+        lines.append('{:>10} {:<7} {}'.format(
+            op['size'], op['method'].upper(), op['path']))
+    return lines
+
+
+def _operation_sections(operation, pieces):
+    """
+    Split an operation's size into sections.
+
+    :param dict operation: the swagger operation
+    :param dict pieces: mapping of section name to a list that the
+        serialized pieces are appended to for duplication accounting
+    :return: mapping of section name to size
+    :rtype: dict
+
+    """
+    sizes = dict.fromkeys(SECTIONS, 0)
+    for name, value in operation.items():
+        serialized = _serialize(value)
+        if name == 'parameters':
+            section = 'parameters'
+            pieces[section].extend(_serialize(p) for p in value)
+        elif name == 'responses':
+            section = 'responses'
+            pieces[section].extend(_serialize(r) for r in value.values())
+        elif name in ('summary', 'description'):
+            section = 'descriptions'
+            pieces[section].append(serialized)
+        elif name == 'x-debug-info':
+            section = 'x-debug-info'
+            pieces[section].append(serialized)
+        else:
+            section = 'other'
+        sizes[section] += _member_size(name, value, OPERATION_DEPTH)
+
+    # schemas are nested inside of parameters and responses so move
+    # their share out of the containing section.  Parameters are list
+    # items and responses are members so both schemas are two levels
+    # below the members of the operation.
+    for section, containers in (
+            ('parameters', operation.get('parameters', [])),
+            ('responses', operation.get('responses', {}).values())):
+        for container in containers:
+            if 'schema' in container:
+                pieces['schemas'].append(_serialize(container['schema']))
+                size = _member_size('schema', container['schema'],
+                                    OPERATION_DEPTH + 2)
+                sizes['schemas'] += size
+                sizes[section] -= size
+    return sizes
+
+
+def _duplication_ratio(pieces):
+    total = sum(len(piece) for piece in pieces)
+    if not total:
+        return 0.0
+    unique = sum(len(piece) for piece in set(pieces))
+    return 1.0 - unique / float(total)
+
+
+def _serialize(value):
+    return json.dumps(value, indent=2).encode('utf-8')
+
+
+def _size(value, depth=0):
+    """
+    Return the serialized size of `value` nested `depth` levels deep.
+
+    Every line after the first is indented by two more spaces for each
+    level that the value is nested in the document.
+
+    """
+    serialized = _serialize(value)
+    return len(serialized) + serialized.count(b'\n') * 2 * depth
+
+
+def _member_size(name, value, depth):
+    """Return the size of the ``"name": value`` line of an object."""
+    return (2 * depth + len(_serialize(name)) + len(b': ') +
+            _size(value, depth))
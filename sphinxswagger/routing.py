@@ -0,0 +1,171 @@
+"""
+Prefix tree of the URI templates in a swagger document.
+
+The index maps a request path to the swagger operation that handles it
+with one dictionary lookup per path segment instead of trying every
+template in turn.  :func:`build_route_index` creates the serializable
+form that the builder writes next to the swagger file and
+:class:`RouteIndex` loads it for matching.
+
+"""
+import json
+import re
+
+
+INDEX_VERSION = 2
+PARAMETER_RE = re.compile(r'\{([^}]+)\}')
+
+
+def build_route_index(swagger):
+    """
+    Build the route index for a swagger document.
+
+    :param dict swagger: the swagger document
+    :return: the index as a JSON-serializable :class:`dict`
+    :rtype: dict
+
+    Each node contains a ``static`` mapping of literal segments to child
+    nodes, a ``param`` child for segments that are a single template
+    parameter, and a list of ``patterns`` for segments that mix literal
+    text and parameters.  Nodes that terminate a template contain a
+    ``route`` with the template, its methods, and its parameter names.
+
+    """
+    root = _new_node()
+    for template, operations in swagger.get('paths', {}).items():
+        node, params = root, []
+        for segment in _split_path(template):
+            names = PARAMETER_RE.findall(segment)
+            if not names:
+                node = node['static'].setdefault(segment, _new_node())
+            elif segment == '{' + names[0] + '}':
+                if node['param'] is None:
+                    node['param'] = _new_node()
+                node = node['param']
+            else:
+                pattern = _segment_pattern(segment)
+                for existing, child in node['patterns']:
+                    if existing == pattern:
+                        node = child
+                        break
+                else:
+                    child = _new_node()
+                    node['patterns'].append([pattern, child])
+                    node = child
+            params.extend(names)
+        node['route'] = {'template': template,
+                         'methods': sorted(operations),
+                         'params': params}
+    return {'version': INDEX_VERSION, 'root': root}
+
+
+def write_route_index(file_name, swagger):
+    """
+    Write the route index for `swagger` to `file_name` as JSON.
+
+    :param str file_name: path of the file to write
+    :param dict swagger: the swagger document
+
+    """
+    with open(file_name, 'w') as f:
+        json.dump(build_route_index(swagger), f, separators=(',', ':'))
+
+
+class RouteIndex(object):
+    """
+    Matches request paths against the indexed URI templates.
+
+    :param dict index: the index as returned by :func:`build_route_index`
+
+    """
+
+    def __init__(self, index):
+        if index.get('version') != INDEX_VERSION:
+            raise ValueError('unsupported route index version {!r}'.format(
+                index.get('version')))
+        self._root = self._compile(index['root'])
+
+    @classmethod
+    def load(cls, file_name):
+        """Load an index that was written by :func:`write_route_index`."""
+        with open(file_name) as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_document(cls, swagger):
+        """Build an index directly from a swagger document."""
+        return cls(build_route_index(swagger))
+
+    def match(self, path):
+        """
+        Find the route for a request path.
+
+        :param str path: the request path without a query string
+        :return: a ``(template, parameters, methods)`` tuple or
+            :data:`None` if no template matches.  ``parameters`` is a
+            :class:`dict` of the template parameter values and
+            ``methods`` is the list of operations on the template.
+        :rtype: tuple
+
+        """
+        segments = _split_path(path)
+        found = self._match(self._root, segments, 0, [])
+        if found is None:
+            return None
+        route, values = found
+        return (route['template'], dict(zip(route['params'], values)),
+                route['methods'])
+
+    def _match(self, node, segments, position, values):
+        if position == len(segments):
+            route = node[3]
+            return (route, values) if route is not None else None
+
+        static, param, patterns = node[0], node[1], node[2]
+        segment = segments[position]
+        child = static.get(segment)
+        if child is not None:
+            found = self._match(child, segments, position + 1, values)
+            if found is not None:
+                return found
+        for regex, child in patterns:
+            match = regex.match(segment)
+            if match is not None:
+                found = self._match(child, segments, position + 1,
+                                    values + list(match.groups()))
+                if found is not None:
+                    return found
+        if param is not None and segment:
+            return self._match(param, segments, position + 1,
+                               values + [segment])
+        return None
+
+    def _compile(self, node):
+        return (
+            {segment: self._compile(child)
+             for segment, child in node['static'].items()},
+            self._compile(node['param']) if node['param'] else None,
+            [(re.compile(pattern), self._compile(child))
+             for pattern, child in node['patterns']],
+            node.get('route'),
+        )
+
+
+def _new_node():
+    return {'static': {}, 'param': None, 'patterns': []}
+
+
+def _split_path(path):
+    # only the leading slash is removed so that a trailing slash leaves
+    # an empty final segment and /ip/ does not match /ip
+    return (path[1:] if path.startswith('/') else path).split('/')
+
+
+def _segment_pattern(segment):
+    pattern, start = [], 0
+    for match in PARAMETER_RE.finditer(segment):
+        pattern.append(re.escape(segment[start:match.start()]))
+        pattern.append('([^/]+?)')
+        start = match.end()
+    pattern.append(re.escape(segment[start:]))
+    return ''.join(pattern) + '$'
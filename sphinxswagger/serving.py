@@ -0,0 +1,185 @@
+"""
+Serve the API definition from memory that is shared between processes.
+
+Pre-forking servers run many worker processes that each load their own
+copy of the API definition.  The *artifact* written by
+:func:`write_artifact` contains the encoded document, a gzip compressed
+copy, and a small index of both.  :class:`SharedSpec` maps the artifact
+read-only so that every worker on a host serves from the same pages of
+the operating system's page cache instead of holding a private copy.
+
+Each body has its own entity tag so that a client which validates a
+cached copy gets the same encoding back.  The artifact is laid out as::
+
+   MAGIC | index length (4 bytes, big-endian) | JSON index | bodies...
+
+The build replaces the artifact atomically and :class:`SharedSpec`
+notices the new file and maps it in place of the old one.
+
+"""
+import gzip
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+
+MAGIC = b'SWAGGER\x02'
+
+_LENGTH = struct.Struct('>I')
+
+
+def write_artifact(file_name, encoded, content_type='application/json'):
+    """
+    Write the servable artifact for an encoded API definition.
+
+    :param str file_name: path of the artifact to write.  It is replaced
+        atomically so that readers never observe a partial file.
+    :param bytes encoded: the encoded API definition
+    :param str content_type: the media type of `encoded`
+
+    """
+    compressed = io.BytesIO()
+    with gzip.GzipFile(fileobj=compressed, mode='wb', mtime=0) as f:
+        f.write(encoded)
+    compressed = compressed.getvalue()
+
+    index = {'content_type': content_type,
+             'last_modified': time.time(),
+             'bodies': {},
+             'etags': {}}
+    # offsets are relative to the end of the index so that the index
+    # does not need to know its own length
+    offset = 0
+    for encoding, body in (('identity', encoded), ('gzip', compressed)):
+        index['bodies'][encoding] = [offset, len(body)]
+        index['etags'][encoding] = hashlib.md5(body).hexdigest()
+        offset += len(body)
+    encoded_index = json.dumps(index, sort_keys=True).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(file_name))
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_LENGTH.pack(len(encoded_index)))
+            f.write(encoded_index)
+            f.write(encoded)
+            f.write(compressed)
+        os.chmod(temp_name, 0o644)
+        os.replace(temp_name, file_name)
+    except Exception:
+        os.unlink(temp_name)
+        raise
+
+
+class SharedSpec(object):
+    """
+    Read-only view of an artifact written by :func:`write_artifact`.
+
+    :param str file_name: path of the artifact
+    :param float check_interval: minimum number of seconds between
+        checks for a replaced artifact
+
+    The artifact is mapped when the instance is created.  Create it
+    before or after forking -- the mapping is backed by the page cache
+    so either way the bodies are only held in memory once per host.
+    :attr:`etags` maps each encoding to the entity tag of its body.
+
+    """
+
+    def __init__(self, file_name, check_interval=1.0):
+        super(SharedSpec, self).__init__()
+        self.file_name = file_name
+        self.check_interval = check_interval
+        self.content_type = None
+        self.etags = {}
+        self.last_modified = None
+        self._bodies = {}
+        self._identity = None
+        self._next_check = 0
+        self._map()
+
+    def refresh(self):
+        """
+        Map the artifact again if the build replaced it.
+
+        :return: :data:`True` if the artifact was mapped again
+        :rtype: bool
+
+        This only looks at the file once per `check_interval`.
+
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+        try:
+            st = os.stat(self.file_name)
+        except OSError:
+            return False
+        if (st.st_ino, st.st_mtime, st.st_size) == self._identity:
+            return False
+        self._map()
+        return True
+
+    def select(self, accept_encoding=None):
+        """
+        Select the encoding to send.
+
+        :param str accept_encoding: the ``Accept-Encoding`` request
+            header if there is one
+        :return: ``gzip`` or ``identity``
+        :rtype: str
+
+        This is where a replaced artifact is noticed so call it once at
+        the start of a request and use the result with :attr:`etags`
+        and :meth:`body`.
+
+        """
+        self.refresh()
+        if accept_encoding and 'gzip' in accept_encoding:
+            return 'gzip'
+        return 'identity'
+
+    def body(self, encoding):
+        """
+        Retrieve the body in an encoding from :meth:`select`.
+
+        :param str encoding: ``gzip`` or ``identity``
+        :return: a :class:`memoryview` of the mapping
+        :rtype: memoryview
+
+        """
+        return self._bodies[encoding]
+
+    def _map(self):
+        with open(self.file_name, 'rb') as f:
+            st = os.fstat(f.fileno())
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if mapping[:len(MAGIC)] != MAGIC:
+            mapping.close()
+            raise ValueError('{} is not a swagger artifact'.format(
+                self.file_name))
+        start = len(MAGIC) + _LENGTH.size
+        index_length, = _LENGTH.unpack(mapping[len(MAGIC):start])
+        index = json.loads(
+            mapping[start:start + index_length].decode('utf-8'))
+        start += index_length
+
+        # The previous mapping is not closed explicitly since responses
+        # that are still being written may hold views of it.  It is
+        # unmapped when the last view is released.
+        view = memoryview(mapping)
+        self._bodies = {
+            encoding: view[start + offset:start + offset + length]
+            for encoding, (offset, length) in index['bodies'].items()}
+        self.content_type = index['content_type']
+        self.etags = index['etags']
+        self.last_modified = index['last_modified']
+        self._identity = (st.st_ino, st.st_mtime, st.st_size)
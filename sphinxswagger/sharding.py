@@ -0,0 +1,113 @@
+"""
+Split the build of one project across several machines.
+
+A shard specification such as ``3/8`` selects the third of eight
+shards.  Documents are assigned to shards by the CRC-32 of their name
+so every machine agrees on the partition without coordinating.  Each
+shard reads every document so that cross-references resolve as they do
+in a complete build, translates only its own documents, and writes a
+*fragment* that records which document every operation came from.
+:func:`merge_fragments` replays the fragments in document order which
+produces the same document as a build that is not sharded.
+
+"""
+import os.path
+import zlib
+
+
+def parse_shard(spec):
+    """
+    Parse a shard specification.
+
+    :param str spec: the specification in ``index/count`` form where
+        `index` starts at one
+    :return: ``(index, count)`` tuple
+    :rtype: tuple
+    :raises ValueError: if `spec` is malformed
+
+    """
+    index, sep, count = str(spec).partition('/')
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        index = count = 0
+    if not sep or count < 1 or not 1 <= index <= count:
+        raise ValueError('invalid shard {!r}, expected index/count'.format(
+            spec))
+    return index, count
+
+
+def in_shard(docname, shard):
+    """
+    Is a document part of a shard?
+
+    :param str docname: the name of the document
+    :param tuple shard: ``(index, count)`` tuple from :func:`parse_shard`
+    :rtype: bool
+
+    """
+    index, count = shard
+    return zlib.crc32(docname.encode('utf-8')) % count == index - 1
+
+
+def fragment_file_name(file_name, shard):
+    """
+    Generate the name of the fragment written by a shard.
+
+    :param str file_name: the name of the swagger file
+    :param tuple shard: ``(index, count)`` tuple from :func:`parse_shard`
+    :rtype: str
+
+    """
+    root, ext = os.path.splitext(file_name)
+    return '{}.shard-{}-of-{}{}'.format(root, shard[0], shard[1],
+                                        ext or '.json')
+
+
+def merge_fragments(fragments):
+    """
+    Combine the fragments written by every shard of a build.
+
+    :param list fragments: the decoded fragments
+    :return: the swagger document
+    :rtype: dict
+    :raises ValueError: if a shard is missing or the fragments come
+        from different builds
+
+    """
+    shards = sorted(tuple(fragment['shard']) for fragment in fragments)
+    count = shards[0][1] if shards else 0
+    expected = [(index, count) for index in range(1, count + 1)]
+    if not shards or shards != expected:
+        raise ValueError('expected one fragment for each of {} shards, '
+                         'got {}'.format(count, ', '.join(
+                             '{}/{}'.format(*shard) for shard in shards)))
+
+    entries = []
+    for fragment in fragments:
+        entries.extend(fragment['operations'])
+    # sorted() is stable so operations from the same document stay in
+    # the order that they were translated in
+    entries.sort(key=lambda entry: entry['docname'] or '')
+
+    swagger = dict(fragments[0]['document'])
+    paths = swagger['paths'] = {}
+    for entry in entries:
+        paths.setdefault(entry['path'], {})[entry['method']] = \
+            entry['operation']
+    return swagger
+
+
+def fragment_sources(fragments):
+    """
+    Find where the operations in a set of fragments were defined.
+
+    :param list fragments: the decoded fragments
+    :return: mapping of ``(path, method)`` to ``(docname, line)``
+    :rtype: dict
+
+    """
+    return {(entry['path'], entry['method']):
+            (entry['docname'], entry.get('line'))
+            for fragment in fragments
+            for entry in fragment['operations']}
@@ -0,0 +1,76 @@
+"""
+Dependency tracking for endpoints documented from Python source.
+
+Endpoints that ``sphinxcontrib.autohttp.tornado`` generates come from
+handler docstrings.  Sphinx does not know about those files so editing a
+handler does not cause the document that contains the ``autotornado``
+directive to be read again.  :func:`track_autotornado_sources` wraps the
+directive so that the source file of every documented handler method
+is recorded as a dependency of the document.  Sphinx then marks only the
+affected documents as outdated when one of those files changes.
+
+"""
+import inspect
+
+
+def track_autotornado_sources(app):
+    """
+    Replace the ``autotornado`` directive with a dependency tracking one.
+
+    :param sphinx.application.Sphinx app: the running application
+
+    This is connected to the ``builder-inited`` event so that it runs
+    after every extension has registered its directives.  Nothing happens
+    if the ``swagger_track_sources`` configuration value is false or if
+    ``sphinxcontrib.autohttp.tornado`` is not available.
+
+    """
+    if not app.config.swagger_track_sources:
+        return
+
+    try:
+        from sphinxcontrib.autohttp import tornado as autotornado
+    except ImportError:
+        return
+
+    from docutils.parsers.rst import directives
+
+    base = autotornado.AutoTornadoDirective
+
+    class TrackingAutoTornadoDirective(base):
+        """Notes the handler source files as document dependencies."""
+
+        def run(self):
+            result = base.run(self)
+            env = self.state.document.settings.env
+            application = autotornado.import_object(self.arguments[0])
+            for file_name in sorted(handler_source_files(
+                    autotornado.get_routes(application))):
+                env.note_dependency(file_name)
+            return result
+
+    directives.register_directive('autotornado', TrackingAutoTornadoDirective)
+
+
+def handler_source_files(routes):
+    """
+    Find the files that documented handlers are defined in.
+
+    :param routes: iterable of ``(method, path, handler_class)`` tuples
+        as generated by ``sphinxcontrib.autohttp.tornado.get_routes``
+    :return: :class:`set` of source file names.  Both the handler class
+        and the class that defines the documented method are included
+        since the docstring may be inherited.
+    :rtype: set
+
+    """
+    files = set()
+    for method, _, handler in routes:
+        for obj in (handler, getattr(handler, method, None)):
+            try:
+                file_name = inspect.getsourcefile(obj)
+            except TypeError:  # built-in or None
+                continue
+            if file_name:
+                files.add(file_name)
+    return files
@@ -0,0 +1,131 @@
+"""
+Structural validation of generated swagger documents.
+
+The checks cover the parts of the Swagger 2.0 specification that the
+builder produces -- operations, parameters, and responses.  They are
+compiled into lookup tables when the module is imported.  Checking an
+operation is cheaper than serializing it, so every operation is checked
+on every build instead of caching the results.
+
+"""
+import re
+
+
+HTTP_METHODS = frozenset(['get', 'put', 'post', 'delete', 'options', 'head',
+                          'patch'])
+PARAMETER_LOCATIONS = frozenset(['query', 'header', 'path', 'formData',
+                                 'body'])
+PARAMETER_TYPES = frozenset(['string', 'number', 'integer', 'boolean',
+                             'array', 'file'])
+SCHEMA_TYPES = PARAMETER_TYPES - {'file'} | {'object', 'null'}
+RESPONSE_CODE_RE = re.compile(r'^(default|[1-5]\d\d)$')
+TEMPLATE_PARAMETER_RE = re.compile(r'\{([^}]+)\}')
+
+
+def validate_operation(path, method, operation):
+    """
+    Check a single swagger operation.
+
+    :param str path: the URI template that the operation belongs to
+    :param str method: the HTTP method of the operation
+    :param dict operation: the swagger operation object
+    :return: list of error messages which is empty if the operation
+        is valid
+    :rtype: list
+
+    """
+    errors = []
+    if method not in HTTP_METHODS:
+        errors.append('unknown HTTP method {}'.format(method))
+
+    responses = operation.get('responses')
+    if not responses:
+        errors.append('responses must contain at least one response')
+    else:
+        for code, response in responses.items():
+            if not RESPONSE_CODE_RE.match(str(code)):
+                errors.append('invalid response code {}'.format(code))
+            if 'description' not in response:
+                errors.append('response {} is missing a description'.format(
+                    code))
+            if 'schema' in response:
+                _validate_schema(response['schema'],
+                                 'response {} schema'.format(code), errors)
+
+    seen, body_count = set(), 0
+    path_params = set()
+    for param in operation.get('parameters', []):
+        name, location = param.get('name'), param.get('in')
+        if not name:
+            errors.append('parameter without a name')
+        if location not in PARAMETER_LOCATIONS:
+            errors.append('parameter {} has invalid location {!r}'.format(
+                name, location))
+        if (name, location) in seen:
+            errors.append('duplicate {} parameter {}'.format(location, name))
+        seen.add((name, location))
+
+        if location == 'body':
+            body_count += 1
+            if 'schema' not in param:
+                errors.append('body parameter {} is missing a schema'.format(
+                    name))
+            else:
+                _validate_schema(param['schema'],
+                                 'body parameter {} schema'.format(name),
+                                 errors)
+        elif param.get('type') not in PARAMETER_TYPES:
+            errors.append('parameter {} has invalid type {!r}'.format(
+                name, param.get('type')))
+
+        if location == 'path':
+            path_params.add(name)
+            if param.get('required') is not True:
+                errors.append('path parameter {} must be required'.format(
+                    name))
+
+    if body_count > 1:
+        errors.append('only one body parameter is allowed')
+    for name in TEMPLATE_PARAMETER_RE.findall(path):
+        if name not in path_params:
+            errors.append('path parameter {} is not declared'.format(name))
+    for name in path_params - set(TEMPLATE_PARAMETER_RE.findall(path)):
+        errors.append('path parameter {} is not in the path'.format(name))
+
+    return errors
+
+
+def _validate_schema(schema, where, errors):
+    schema_type = schema.get('type')
+    if schema_type is not None and schema_type not in SCHEMA_TYPES:
+        errors.append('{} has invalid type {!r}'.format(where, schema_type))
+    if schema_type == 'array':
+        if 'items' not in schema:
+            errors.append('{} is an array without items'.format(where))
+        else:
+            _validate_schema(schema['items'], where + ' items', errors)
+    for name, prop in schema.get('properties', {}).items():
+        _validate_schema(prop, '{} property {}'.format(where, name), errors)
+    for name in schema.get('required', []):
+        if name not in schema.get('properties', {}):
+            errors.append('{} requires undefined property {}'.format(
+                where, name))
+
+
+def validate_document(swagger):
+    """
+    Validate every operation in a swagger document.
+
+    :param dict swagger: the swagger document
+    :return: list of ``(path, method, errors)`` tuples for each
+        operation that has errors
+    :rtype: list
+
+    """
+    failures = []
+    for path, path_info in swagger.get('paths', {}).items():
+        for method, operation in path_info.items():
+            errors = validate_operation(path, method, operation)
+            if errors:
+                failures.append((path, method, errors))
+    return failures
@@ -0,0 +1,186 @@
+"""
+Request validators compiled from a generated swagger document.
+
+The validators are plain closures that are specialized for a single
+operation when they are compiled.  Nothing in the schema is interpreted
+when a request is validated.
+
+"""
+import re
+
+
+_PARAMETER_LOCATIONS = ('path', 'query', 'header')
+
+# int() and float() also accept surrounding whitespace, underscores,
+# nan, and inf which are not valid parameter values
+_INTEGER_RE = re.compile(r'^[-+]?[0-9]+\Z')
+_NUMBER_RE = re.compile(
+    r'^[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?\Z')
+
+
+class ValidationError(ValueError):
+    """Raised when a request does not match its operation."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super(ValidationError, self).__init__('; '.join(errors))
+
+
+def compile_validators(swagger):
+    """
+    Compile a validator for every operation in a swagger document.
+
+    :param dict swagger: the swagger document as returned from
+        :meth:`sphinxswagger.document.SwaggerDocument.get_document`
+    :return: :class:`dict` mapping ``(method, uri_template)`` to the
+        validator for the operation
+    :rtype: dict
+
+    """
+    return {(method, path): compile_operation(operation)
+            for path, operations in swagger.get('paths', {}).items()
+            for method, operation in operations.items()}
+
+
+def compile_operation(operation):
+    """
+    Compile a validator for a single swagger operation.
+
+    :param dict operation: the swagger operation object
+    :return: a callable that accepts the path arguments, query arguments,
+        request headers, and decoded request body as keyword parameters.
+        Each of the mappings contains string values.  The header
+        mapping should be case-insensitive like
+        :class:`tornado.httputil.HTTPHeaders`.
+        The callable raises :exc:`ValidationError` describing every
+        problem with the request.
+
+    """
+    checks = {location: [] for location in _PARAMETER_LOCATIONS}
+    body_check = None
+    for param in operation.get('parameters', []):
+        if param['in'] == 'body':
+            body_check = _compile_schema(param.get('schema', {}))
+            body_required = param.get('required', False)
+        elif param['in'] in checks:
+            checks[param['in']].append(
+                (param['name'], param.get('required', False),
+                 _STRING_CHECKS.get(param.get('type'), _accept)))
+
+    path_checks = tuple(checks['path'])
+    query_checks = tuple(checks['query'])
+    header_checks = tuple(checks['header'])
+
+    def validate(path_args=None, query_args=None, headers=None, body=None):
+        errors = []
+        for location, values, parameters in (('path', path_args, path_checks),
+                                             ('query', query_args,
+                                              query_checks),
+                                             ('header', headers,
+                                              header_checks)):
+            values = values or {}
+            for name, required, check in parameters:
+                value = values.get(name)
+                if value is None:
+                    if required:
+                        errors.append('missing {} parameter {}'.format(
+                            location, name))
+                elif not check(value):
+                    errors.append('invalid {} parameter {}'.format(
+                        location, name))
+        if body_check is not None:
+            if body is None:
+                if body_required:
+                    errors.append('missing request body')
+            else:
+                body_check(body, 'body', errors)
+        if errors:
+            raise ValidationError(errors)
+
+    return validate
+
+
+def _accept(value):
+    return True
+
+
+def _is_number_string(value):
+    return _NUMBER_RE.match(value) is not None
+
+
+def _is_integer_string(value):
+    return _INTEGER_RE.match(value) is not None
+
+
+def _is_boolean_string(value):
+    return value.lower() in ('true', 'false')
+
+
+_STRING_CHECKS = {
+    'number': _is_number_string,
+    'integer': _is_integer_string,
+    'boolean': _is_boolean_string,
+}
+
+_VALUE_TYPES = {
+    'string': (str,),
+    'number': (int, float),
+    'integer': (int,),
+    'boolean': (bool,),
+    'object': (dict,),
+    'array': (list,),
+}
+
+
+def _compile_schema(schema):
+    """
+    Compile a JSON schema fragment into a checking closure.
+
+    :param dict schema: the schema to compile
+    :return: a callable that accepts a decoded value, a description of
+        where the value came from, and a list to append errors to
+
+    """
+    schema_type = schema.get('type')
+    value_types = _VALUE_TYPES.get(schema_type)
+    reject_bool = schema_type in ('number', 'integer')
+
+    if schema_type == 'array':
+        check_item = _compile_schema(schema.get('items', {}))
+
+        def check_array(value, where, errors):
+            if not isinstance(value, list):
+                errors.append('{} is not an array'.format(where))
+                return
+            for index, item in enumerate(value):
+                check_item(item, where + '[' + str(index) + ']', errors)
+
+        return check_array
+
+    if schema_type == 'object' and schema.get('properties'):
+        required = tuple(schema.get('required', ()))
+        properties = tuple((name, _compile_schema(prop))
+                           for name, prop in schema['properties'].items())
+
+        def check_object(value, where, errors):
+            if not isinstance(value, dict):
+                errors.append('{} is not an object'.format(where))
+                return
+            for name in required:
+                if name not in value:
+                    errors.append('{}.{} is required'.format(where, name))
+            for name, check in properties:
+                if name in value:
+                    check(value[name], where + '.' + name, errors)
+
+        return check_object
+
+    if value_types is None:
+        return lambda value, where, errors: None
+
+    def check_value(value, where, errors):
+        if (not isinstance(value, value_types) or
+                (reject_bool and isinstance(value, bool))):
+            errors.append('{} is not of type {}'.format(where, schema_type))
+
+    return check_value
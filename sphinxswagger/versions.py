@@ -0,0 +1,182 @@
+"""
+Build the swagger document for many versions of a local repository.
+
+Each git ref is resolved to the tree that it holds for the project
+directory and the tree is exported with ``git archive`` into the build
+directory.  Refs that point at the same tree share one export, one Sphinx
+environment, and one build so identical inputs are only translated once.
+The built document is cached next to the export and reused by later
+runs with the same overrides and the same versions of Sphinx and this
+extension.
+
+Only the local repository is used -- nothing is fetched.
+
+"""
+from concurrent import futures
+import hashlib
+import json
+import os.path
+import re
+import shutil
+import subprocess
+import tarfile
+
+
+def output_name(ref):
+    """
+    Generate the file name that the document for a ref is written to.
+
+    :param str ref: the branch, tag, or commit
+    :return: `ref` with every character that is not a letter, digit,
+        ``.``, ``_``, or ``-`` replaced by ``_`` and ``.json`` appended.
+        Different refs can map to the same name so callers should check
+        for collisions.
+    :rtype: str
+
+    """
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', ref) + '.json'
+
+
+def resolve_tree(repo_dir, ref):
+    """
+    Find the tree that `repo_dir` has in a git ref.
+
+    :param str repo_dir: directory inside of the git repository
+    :param str ref: the branch, tag, or commit to resolve
+    :return: the hex SHA of the tree object for `repo_dir` which is
+        the root tree if `repo_dir` is the top of the repository
+    :rtype: str
+    :raises ValueError: if `ref` cannot be resolved
+
+    """
+    try:
+        output = subprocess.check_output(
+            ['git', 'rev-parse', '--verify', '--quiet',
+             '{}:./'.format(ref)],
+            cwd=repo_dir)
+    except subprocess.CalledProcessError:
+        raise ValueError('cannot resolve git ref {!r}'.format(ref))
+    return output.decode('ascii').strip()
+
+
+def export_tree(repo_dir, tree, destination):
+    """
+    Extract a git tree into a directory.
+
+    :param str repo_dir: directory inside of the git repository
+    :param str tree: the tree to export
+    :param str destination: directory to extract the tree into.  It
+        is replaced atomically so that an interrupted export is never
+        mistaken for a complete one.
+
+    """
+    partial = destination + '.partial'
+    shutil.rmtree(partial, ignore_errors=True)
+    os.makedirs(partial)
+    # git archive only includes the current directory of the tree when
+    # it is run from a sub-directory of the repository
+    top_level = subprocess.check_output(
+        ['git', 'rev-parse', '--show-toplevel'], cwd=repo_dir)
+    process = subprocess.Popen(['git', 'archive', '--format=tar', tree],
+                               cwd=top_level.decode('utf-8').strip(),
+                               stdout=subprocess.PIPE)
+    try:
+        with tarfile.open(fileobj=process.stdout, mode='r|') as archive:
+            archive.extractall(partial)
+    finally:
+        process.stdout.close()
+        if process.wait() != 0:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise ValueError('git archive of {} failed'.format(tree))
+    os.rename(partial, destination)
+
+
+def build_tree(repo_dir, tree, build_dir, config_dir='docs',
+               python_path=('.',), overrides=None):
+    """
+    Build the swagger document for a single git tree.
+
+    :param str repo_dir: directory inside of the git repository
+    :param str tree: the tree to build
+    :param str build_dir: directory that per-tree exports and builds
+        are kept in
+    :param str config_dir: path of the Sphinx configuration directory
+        relative to the top of the tree
+    :param python_path: paths relative to the top of the tree that are
+        added to :data:`sys.path` while building so that *conf.py* and
+        ``autodoc`` import the exported code
+    :param dict overrides: optional configuration overrides
+    :return: the swagger document as a :class:`dict`
+    :rtype: dict
+
+    This function is safe to run in a worker process.  Modules that
+    are imported from the exported tree are removed from
+    :data:`sys.modules` afterwards so that a worker can build another
+    version of the same code.
+
+    """
+    import sphinx
+    import sphinxswagger
+    from sphinxswagger import aggregate, api
+
+    tree_dir = os.path.join(build_dir, tree)
+    # the same tree is built differently for each set of inputs and by
+    # each release of the builder
+    inputs_digest = hashlib.sha1(repr((
+        sorted((overrides or {}).items()), config_dir,
+        tuple(python_path), sphinxswagger.__version__,
+        sphinx.__version__)).encode('utf-8')).hexdigest()
+    output_file = os.path.join(
+        tree_dir, 'swagger-{}.json'.format(inputs_digest[:12]))
+    if os.path.exists(output_file):
+        with open(output_file) as f:
+            return json.load(f)
+
+    source_dir = os.path.join(tree_dir, 'source')
+    if not os.path.isdir(source_dir):
+        export_tree(repo_dir, tree, source_dir)
+
+    with aggregate.isolated_imports(
+            paths=[os.path.join(source_dir, path) for path in python_path],
+            roots=[source_dir]):
+        swagger = api.build(os.path.join(source_dir, config_dir), overrides,
+                            build_dir=os.path.join(tree_dir, 'build'),
+                            reuse=False)
+
+    with open(output_file + '.partial', 'w') as f:
+        json.dump(swagger, f)
+    os.rename(output_file + '.partial', output_file)
+    return swagger
+
+
+def build_versions(repo_dir, refs, build_dir, config_dir='docs',
+                   python_path=('.',), overrides=None, jobs=None):
+    """
+    Build the swagger document for many git refs concurrently.
+
+    :param str repo_dir: directory inside of the git repository
+    :param list refs: the branches, tags, or commits to build
+    :param str build_dir: directory that per-tree exports and builds
+        are kept in
+    :param str config_dir: path of the Sphinx configuration directory
+        relative to `repo_dir`
+    :param python_path: paths relative to `repo_dir` that are
+        importable while building
+    :param dict overrides: optional configuration overrides
+    :param int jobs: maximum number of worker processes.  This defaults
+        to the number of processors on the machine.
+    :return: list of ``(ref, document)`` pairs in the same order as
+        `refs`
+    :rtype: list
+
+    Refs that resolve to the same tree are built once.
+
+    """
+    trees = [resolve_tree(repo_dir, ref) for ref in refs]
+    with futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = {
+            tree: executor.submit(build_tree, repo_dir, tree, build_dir,
+                                  config_dir, tuple(python_path), overrides)
+            for tree in set(trees)}
+        return [(ref, pending[tree].result())
+                for ref, tree in zip(refs, trees)]
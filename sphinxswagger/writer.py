@@ -1,13 +1,18 @@
-from docutils import nodes, writers
+from docutils import nodes, utils, writers
+import hashlib
+import importlib
 import json
 import os.path
 import re
+import weakref
 
-from sphinxswagger import document
+from sphinxswagger import diagnostics, document, endpoints, report, routing
 
 
 URI_TEMPLATE_RE = re.compile(r'\(\?P<([^>]*)>.*\)')
 
+_paragraph_cache = weakref.WeakKeyDictionary()
+
 
 def _find_param_separator(tokens):
     """
@@ -38,44 +43,214 @@ def write_swagger_file(app, exception):
     if getattr(app.builder, 'swagger', None) is None:
         return
 
-    with open(os.path.join(app.outdir, app.config.swagger_file), 'w') as f:
-        json.dump(app.builder.swagger.get_document(app.config), f, indent=2)
+    if app.config.swagger_shard:
+        write_swagger_fragment(app)
+        return
+
+    write_swagger_outputs(app, app.builder.swagger.get_document(app.config),
+                          app.builder.swagger.get_source)
+
+
+def write_swagger_outputs(app, swagger, get_source):
+    """
+    Write the swagger file and the other outputs for a finished document.
+
+    :param sphinx.application.Sphinx app: application whose configuration
+        selects the outputs and whose output directory they are written to
+    :param dict swagger: the complete swagger document
+    :param get_source: function that returns the ``(docname, line)``
+        that an operation was defined on given its path and method
+
+    This is called when a build finishes and by the **swagger_merge**
+    command once the fragments of a sharded build are merged.
+
+    """
+    encoded = json.dumps(swagger, indent=2).encode('utf-8')
+    if app.config.swagger_file:
+        with open(os.path.join(app.outdir, app.config.swagger_file),
+                  'wb') as f:
+            f.write(encoded)
+
+    if app.config.swagger_validate:
+        validate_swagger_document(app, swagger, get_source)
+
+    if app.config.swagger_module_file:
+        write_swagger_module(
+            os.path.join(app.outdir, app.config.swagger_module_file),
+            swagger, encoded)
+
+    if app.config.swagger_artifact_file:
+        from sphinxswagger import serving
+        serving.write_artifact(
+            os.path.join(app.outdir, app.config.swagger_artifact_file),
+            encoded)
+
+    if app.config.swagger_route_index_file:
+        routing.write_route_index(
+            os.path.join(app.outdir, app.config.swagger_route_index_file),
+            swagger)
+
+    if app.config.swagger_size_report or app.config.swagger_size_report_file:
+        size_report = report.size_report(
+            swagger, top=app.config.swagger_size_report_limit)
+        if app.config.swagger_size_report:
+            for line in report.format_size_report(size_report):
+                diagnostics.log_info(app, line)
+        if app.config.swagger_size_report_file:
+            with open(os.path.join(app.outdir,
+                                   app.config.swagger_size_report_file),
+                      'w') as f:
+                json.dump(size_report, f, indent=2)
+
+    if app.config.swagger_archive_dir:
+        from sphinxswagger import archive
+        swagger_archive = archive.SwaggerArchive(
+            os.path.join(app.outdir, app.config.swagger_archive_dir))
+        swagger_archive.store(
+            app.config.swagger_archive_version or swagger['info']['version'],
+            swagger)
+
+
+def write_swagger_fragment(app):
+    """
+    Write the fragment produced by one shard of a build.
+
+    :param sphinx.application.Sphinx app:
+
+    The other outputs describe the complete document so the
+    **swagger_merge** command writes them with
+    :func:`write_swagger_outputs` after the fragments are merged.
+
+    """
+    from sphinxswagger import sharding
+
+    shard = sharding.parse_shard(app.config.swagger_shard)
+    file_name = sharding.fragment_file_name(
+        app.config.swagger_file or 'swagger.json', shard)
+    with open(os.path.join(app.outdir, file_name), 'w') as f:
+        json.dump(app.builder.swagger.get_fragment(app.config, shard), f)
+
+
+def validate_swagger_document(app, swagger, get_source):
+    """
+    Validate the generated document and warn about any problems.
+
+    :param sphinx.application.Sphinx app:
+    :param dict swagger: the generated swagger document
+    :param get_source: function that returns the ``(docname, line)``
+        that an operation was defined on given its path and method
+
+    Each problem is reported against the document and line that the
+    endpoint was defined on.
+
+    """
+    from sphinxswagger import validation
+
+    for path, method, errors in validation.validate_document(swagger):
+        docname, line = get_source(path, method)
+        for error in errors:
+            diagnostics.log_warning(
+                app, '{} {}: {}'.format(method.upper(), path, error),
+                docname=docname, line=line)
+
+
+def write_swagger_module(file_name, swagger, encoded):
+    """
+    Write the swagger document as an importable Python module.
+
+    :param str file_name: path of the module to write
+    :param dict swagger: the swagger document
+    :param bytes encoded: the JSON encoded document
+
+    The module contains the document as a literal in ``DOCUMENT``, the
+    JSON encoded bytes in ``ENCODED``, and the MD5 digest of the encoded
+    bytes in ``DIGEST``.  It is byte-compiled immediately so that importing
+    it does not require parsing anything.
+
+    """
+    import py_compile
+
+    with open(file_name, 'w', encoding='utf-8') as f:
+        f.write('# Generated by sphinxswagger -- do not edit.\n')
+        f.write('DOCUMENT = {!r}\n'.format(swagger))
+        f.write('ENCODED = {!r}\n'.format(encoded))
+        f.write('DIGEST = {!r}\n'.format(
+            hashlib.md5(encoded).hexdigest()))
+    py_compile.compile(file_name, doraise=True)
 
 
 class SwaggerWriter(writers.Writer):
 
     def __init__(self, *args, **kwargs):
         self.swagger_document = kwargs.pop('swagger_document')
+        self.verbosity = kwargs.pop('verbosity', 0)
+        self.stats = kwargs.pop('stats', None) or diagnostics.BuildStats()
+        self.field_handlers = kwargs.pop('field_handlers', None)
+        self.debug_info = kwargs.pop('debug_info', True)
         writers.Writer.__init__(self, *args, **kwargs)
         self.translator_class = SwaggerTranslator
+        self.docname = None
 
     def translate(self):
-        visitor = SwaggerTranslator(self.document, self.swagger_document)
-        self.document.walkabout(visitor)
+        visitor = SwaggerTranslator(self.document, self.swagger_document,
+                                    self.docname, verbosity=self.verbosity,
+                                    stats=self.stats,
+                                    field_handlers=self.field_handlers,
+                                    debug_info=self.debug_info)
+        with self.stats.timed('translate document'):
+            for node in endpoints.find_endpoint_nodes(self.document):
+                node.walkabout(visitor)
 
 
 class SwaggerTranslator(nodes.SparseNodeVisitor):
 
-    def __init__(self, document, output_document):
+    def __init__(self, document, output_document, docname=None,
+                 verbosity=0, stats=None, field_handlers=None,
+                 debug_info=True):
         """
         :param docutils.nodes.document document:
         :param sphinxswagger.document.Document output_document:
+        :param str docname: name of the document being translated
+        :param int verbosity: the Sphinx verbosity level.  Informational
+            messages are reported at one and debugging messages at two
+            or more.
+        :param sphinxswagger.diagnostics.BuildStats stats: optional
+            statistics collector
+        :param dict field_handlers: optional field handler registry
+            passed to :class:`EndpointVisitor`
+        :param bool debug_info: include the node tree of each endpoint
+            as ``x-debug-info`` in the output document
         """
         nodes.NodeVisitor.__init__(self, document)  # assigns self.document
         self.document = document  # tells pycharm the attributes type
-        document.reporter.report_level = document.reporter.DEBUG_LEVEL
+        reporter = document.reporter
+        if verbosity > 1:
+            reporter.debug_flag = True
+            reporter.report_level = reporter.DEBUG_LEVEL
+        elif verbosity > 0:
+            reporter.report_level = min(reporter.report_level,
+                                        reporter.INFO_LEVEL)
+        self._debug_enabled = reporter.debug_flag
+        self._info_enabled = reporter.report_level <= reporter.INFO_LEVEL
         self._swagger_doc = output_document
+        self._docname = docname
+        self.stats = stats or diagnostics.BuildStats()
+        self.field_handlers = field_handlers
+        self.debug_info = debug_info
 
         self._current_node = None
         self._endpoint = None
 
     def debug(self, message, *args, **kwargs):
-        self.document.reporter.debug(message.format(*args, **kwargs),
-                                     base_node=self._current_node)
+        # formatting is skipped unless the message will be reported
+        if self._debug_enabled:
+            self.document.reporter.debug(message.format(*args, **kwargs),
+                                         base_node=self._current_node)
 
     def info(self, message, *args, **kwargs):
-        self.document.reporter.info(message.format(*args, **kwargs),
-                                    base_node=self._current_node)
+        if self._info_enabled:
+            self.document.reporter.info(message.format(*args, **kwargs),
+                                        base_node=self._current_node)
 
     def warning(self, message, *args, **kwargs):
         self.document.reporter.warning(message.format(*args, **kwargs),
@@ -99,8 +274,11 @@ class SwaggerTranslator(nodes.SparseNodeVisitor):
         :param sphinx.addnodes.desc node:
         """
         assert self._current_node is node
-        self._swagger_doc.add_endpoint(self._endpoint,
-                                       _generate_debug_tree(node))
+        self.stats.increment('endpoints')
+        _, line = utils.get_source_line(node)
+        debug_tree = _generate_debug_tree(node) if self.debug_info else None
+        self._swagger_doc.add_endpoint(self._endpoint, debug_tree,
+                                       docname=self._docname, line=line)
         self._endpoint = None
         self._current_node = None
 
@@ -141,7 +319,8 @@ class SwaggerTranslator(nodes.SparseNodeVisitor):
         self.debug('visiting {}: {!r}', node.__class__, node.attributes)
         if node.parent is self._current_node:
             # description of the endpoint itself
-            walker = EndpointVisitor(self.document, self._endpoint)
+            walker = EndpointVisitor(self.document, self._endpoint,
+                                     self.field_handlers, self.stats)
             node.walkabout(walker)
             self._endpoint.description = '\n\n'.join(walker.description)
 
@@ -149,15 +328,24 @@ class SwaggerTranslator(nodes.SparseNodeVisitor):
 class EndpointVisitor(nodes.SparseNodeVisitor):
     """Visits the content for a single endpoint."""
 
-    def __init__(self, document, endpoint):
+    def __init__(self, document, endpoint, field_handlers=None,
+                 stats=None):
         """
         :param docutils.nodes.document document:
         :param sphinxswagger.document.SwaggerEndpoint endpoint:
+        :param dict field_handlers: mapping of normalized field names to
+            handler functions.  :data:`FIELD_HANDLERS` is used if this
+            is omitted.
+        :param sphinxswagger.diagnostics.BuildStats stats: optional
+            statistics collector
         """
         nodes.SparseNodeVisitor.__init__(self, document)
         self.document = document
         self.endpoint = endpoint
         self.description = []
+        self.field_handlers = (FIELD_HANDLERS if field_handlers is None
+                               else field_handlers)
+        self.stats = stats or diagnostics.BuildStats()
 
     def visit_paragraph(self, node):
         """
@@ -166,9 +354,8 @@ class EndpointVisitor(nodes.SparseNodeVisitor):
         if not self.endpoint.summary:  # first paragraph is the summary
             self.endpoint.summary = node.astext()
         else:  # others are description
-            visitor = ParagraphVisitor(self.document)
-            node.walkabout(visitor)
-            self.description.append(visitor.get_paragraph())
+            self.description.append(
+                _render_paragraph(self.document, node))
 
     def visit_field(self, node):
         """
@@ -180,51 +367,13 @@ class EndpointVisitor(nodes.SparseNodeVisitor):
             idx = node.first_child_matching_class(nodes.field_body)
             value_node = node[idx]
             name = name_node.astext()
-            if name == 'Status Codes':
-                visitor = StatusVisitor(self.document)
-                value_node.walkabout(visitor)
-                self.endpoint.add_response_codes(visitor.status_info)
-            elif name == 'Request Headers':
-                visitor = HeaderVisitor(self.document)
-                value_node.walkabout(visitor)
-                self.endpoint.add_request_headers(visitor.headers)
-            elif name == 'Response Headers':
-                visitor = HeaderVisitor(self.document)
-                value_node.walkabout(visitor)
-                self.endpoint.add_response_headers(visitor.headers)
-            elif name == 'Parameters':
-                visitor = ParameterVisitor(self.document,
-                                           {'in': 'path', 'required': True})
-                value_node.walkabout(visitor)
-                self.endpoint.parameters.extend(visitor.parameters)
-            elif name == 'Query Parameters':
-                visitor = ParameterVisitor(self.document, {'in': 'query'})
-                value_node.walkabout(visitor)
-                self.endpoint.parameters.extend(visitor.parameters)
-            elif name == 'Request JSON Object':
-                visitor = ParameterVisitor(self.document)
-                value_node.walkabout(visitor)
-                self.endpoint.parameters.append({
-                    'name': 'request-body', 'in': 'body', 'required': True,
-                    'description': 'A serialized request body',
-                    'schema': visitor.get_schema()})
-            elif name == 'Request JSON Array of Objects':
-                visitor = ParameterVisitor(self.document)
-                value_node.walkabout(visitor)
-                self.endpoint.parameters.append({
-                    'name': 'request-body', 'in': 'body', 'required': True,
-                    'schema': {'type': 'array', 'items': visitor.get_schema()}
-                })
-            elif name == 'Response JSON Object':
-                visitor = ParameterVisitor(self.document)
-                value_node.walkabout(visitor)
-                self.endpoint.set_default_response_structure(visitor.parameters)
-            elif name == 'Response JSON Array of Objects':
-                visitor = ParameterVisitor(self.document)
-                value_node.walkabout(visitor)
-                self.endpoint.set_default_response_structure(
-                    visitor.parameters, is_array=True)
+            normalized = normalize_field_name(name)
+            handler = self.field_handlers.get(normalized)
+            if handler is not None:
+                with self.stats.timed('field: ' + normalized):
+                    handler(self, value_node)
             else:
+                self.stats.increment('unhandled field: ' + normalized)
                 self.document.reporter.warning(
                     'unhandled field type: {}'.format(name), base_node=node)
             raise nodes.SkipChildren
@@ -260,9 +409,7 @@ class ParameterVisitor(nodes.SparseNodeVisitor):
             'bool': 'boolean',
         }
 
-        visitor = ParagraphVisitor(self.document)
-        node[0].walkabout(visitor)
-        tokens = visitor.get_paragraph().split()
+        tokens = _render_paragraph(self.document, node[0]).split()
 
         idx = _find_param_separator(tokens)
         try:
@@ -297,9 +444,7 @@ class StatusVisitor(nodes.SparseNodeVisitor):
         # 0: code (' ' reason)?
         # 1: ' -- '
         # 2+: description
-        visitor = ParagraphVisitor(self.document)
-        node[0].walkabout(visitor)
-        tokens = visitor.get_paragraph().split()
+        tokens = _render_paragraph(self.document, node[0]).split()
         if tokens[0].startswith('['):  # have a link, protect it
             code = tokens[0][1:]
             tokens[1] = '[' + tokens[1]
@@ -317,77 +462,76 @@ class ParagraphVisitor(nodes.SparseNodeVisitor):
     """
     Renders a paragraph node into GitHub-Flavoured Markdown.
 
-    The result is a list of formatted chunks that you can retrieve
-    from :meth:`get_paragraph`.
+    Text and markup are appended to a single buffer as the nodes are
+    visited so each piece is only copied once regardless of how deeply
+    the inline markup is nested.  Retrieve the result from
+    :meth:`get_paragraph`.
 
     """
 
     def __init__(self, document):
         nodes.SparseNodeVisitor.__init__(self, document)
-        self.chunks = []
-        self._stack = []
+        self._buffer = []
+        self._separate = False
 
     def get_paragraph(self):
         """
-        Retrieve the formatted chunks of text.
+        Retrieve the formatted text.
 
         :return: the formatted text as a :class:`str`
         :rtype: str
 
         """
-        return ' '.join(' '.join(chunk.strip().split())
-                        for chunk in self.chunks
-                        if chunk.strip())
-
-    def _push_position(self):
-        """Push the current position onto the stack."""
-        self._stack.append(len(self.chunks))
-
-    def _pop_saved_chunks(self):
-        """
-        Pop the chunks that have been collected since the last push.
-
-        :return: the chunks joined as a string
-        :rtype: str
-
-        """
-        start = self._stack.pop()
-        content = ' '.join(self.chunks[start:])
-        del self.chunks[start:]
-        return content
+        return ' '.join(''.join(self._buffer).split())
+
+    def _append_text(self, text):
+        """Append `text` separated from the preceding piece."""
+        if self._separate:
+            self._buffer.append(' ')
+        self._buffer.append(text)
+        self._separate = True
+
+    def _open_markup(self, markup):
+        """Start an inline markup span with `markup`."""
+        if self._separate:
+            self._buffer.append(' ')
+        self._buffer.append(markup)
+        self._separate = False
+
+    def _close_markup(self, markup):
+        """Finish an inline markup span with `markup`."""
+        self._buffer.append(markup)
+        self._separate = True
 
     def visit_Text(self, node):
-        self.chunks.append(node.astext())
+        self._append_text(node.astext())
         raise nodes.SkipChildren
 
-    def visit_reference(self, _):
-        self._push_position()
+    def visit_reference(self, node):
+        if 'refuri' in node.attributes:
+            self._open_markup('[')
 
     def depart_reference(self, node):
         if 'refuri' in node.attributes:
-            content = self._pop_saved_chunks()
-            self.chunks.append('[{}]({})'.format(content,
-                                                 node.attributes['refuri']))
-        else:
-            self._stack.pop()
+            self._close_markup('](' + node.attributes['refuri'] + ')')
 
     def visit_literal(self, _):
-        self._push_position()
+        self._open_markup('`')
 
     def depart_literal(self, _):
-        self.chunks.append('`{}`'.format(self._pop_saved_chunks()))
+        self._close_markup('`')
 
     def visit_emphasis(self, _):
-        self._push_position()
+        self._open_markup('*')
 
     def depart_emphasis(self, _):
-        self.chunks.append('*{}*'.format(self._pop_saved_chunks()))
+        self._close_markup('*')
 
     def visit_strong(self, _):
-        self._push_position()
+        self._open_markup('**')
 
     def depart_strong(self, _):
-        self.chunks.append('**{}**'.format(self._pop_saved_chunks()))
+        self._close_markup('**')
 
 
 class HeaderVisitor(nodes.SparseNodeVisitor):
@@ -422,6 +566,210 @@ class HeaderVisitor(nodes.SparseNodeVisitor):
         self.headers[normalized] = description
 
 
+def _handle_status_codes(visitor, body):
+    status_visitor = StatusVisitor(visitor.document)
+    body.walkabout(status_visitor)
+    visitor.endpoint.add_response_codes(status_visitor.status_info)
+
+
+def _handle_request_headers(visitor, body):
+    header_visitor = HeaderVisitor(visitor.document)
+    body.walkabout(header_visitor)
+    visitor.endpoint.add_request_headers(header_visitor.headers)
+
+
+def _handle_response_headers(visitor, body):
+    header_visitor = HeaderVisitor(visitor.document)
+    body.walkabout(header_visitor)
+    visitor.endpoint.add_response_headers(header_visitor.headers)
+
+
+def _handle_path_parameters(visitor, body):
+    param_visitor = ParameterVisitor(visitor.document,
+                                     {'in': 'path', 'required': True})
+    body.walkabout(param_visitor)
+    visitor.endpoint.parameters.extend(param_visitor.parameters)
+
+
+def _handle_query_parameters(visitor, body):
+    param_visitor = ParameterVisitor(visitor.document, {'in': 'query'})
+    body.walkabout(param_visitor)
+    visitor.endpoint.parameters.extend(param_visitor.parameters)
+
+
+def _handle_request_object(visitor, body):
+    param_visitor = ParameterVisitor(visitor.document)
+    body.walkabout(param_visitor)
+    visitor.endpoint.parameters.append({
+        'name': 'request-body', 'in': 'body', 'required': True,
+        'description': 'A serialized request body',
+        'schema': param_visitor.get_schema()})
+
+
+def _handle_request_array(visitor, body):
+    param_visitor = ParameterVisitor(visitor.document)
+    body.walkabout(param_visitor)
+    visitor.endpoint.parameters.append({
+        'name': 'request-body', 'in': 'body', 'required': True,
+        'schema': {'type': 'array', 'items': param_visitor.get_schema()}
+    })
+
+
+def _handle_response_object(visitor, body):
+    param_visitor = ParameterVisitor(visitor.document)
+    body.walkabout(param_visitor)
+    visitor.endpoint.set_default_response_structure(param_visitor.parameters)
+
+
+def _handle_response_array(visitor, body):
+    param_visitor = ParameterVisitor(visitor.document)
+    body.walkabout(param_visitor)
+    visitor.endpoint.set_default_response_structure(
+        param_visitor.parameters, is_array=True)
+
+
+def normalize_field_name(name):
+    """
+    Normalize a field name for looking up its handler.
+
+    :param str name: the field name as it appears in the document
+        or in the configuration
+    :return: `name` lower-cased with hyphens and underscores replaced
+        and whitespace collapsed to single spaces
+    :rtype: str
+
+    """
+    return ' '.join(name.lower().replace('-', ' ').replace('_', ' ').split())
+
+
+FIELD_HANDLERS = {
+    normalize_field_name(name): handler for name, handler in (
+        ('Status Codes', _handle_status_codes),
+        ('Request Headers', _handle_request_headers),
+        ('Response Headers', _handle_response_headers),
+        ('Parameters', _handle_path_parameters),
+        ('Query Parameters', _handle_query_parameters),
+        ('Request JSON Object', _handle_request_object),
+        ('Request JSON Array of Objects', _handle_request_array),
+        ('Response JSON Object', _handle_response_object),
+        ('Response JSON Array of Objects', _handle_response_array),
+    )
+}
+"""
+Built-in field handlers keyed by normalized field name.
+
+A field handler is called with the :class:`EndpointVisitor` that found
+the field and the :class:`docutils.nodes.field_body` node.  It updates
+``visitor.endpoint`` as it sees fit.
+
+"""
+
+
+def load_field_handlers(configured=None):
+    """
+    Build the field handler registry for a build.
+
+    :param dict configured: mapping of field names to handlers from the
+        ``swagger_field_handlers`` configuration value.  Handlers may be
+        callables or ``module:function`` strings.
+    :return: :class:`dict` mapping normalized field names to handlers
+    :rtype: dict
+
+    The built-in :data:`FIELD_HANDLERS` are extended by handlers that
+    are registered in the ``sphinxswagger.field_handlers`` entry point
+    group and then by `configured`, so later sources win.
+
+    """
+    handlers = dict(FIELD_HANDLERS)
+    for entry_point in _iter_entry_points('sphinxswagger.field_handlers'):
+        handlers[normalize_field_name(entry_point.name)] = entry_point.load()
+
+    for name, handler in (configured or {}).items():
+        if not callable(handler):
+            module_name, _, attr = handler.partition(':')
+            handler = getattr(importlib.import_module(module_name), attr)
+        handlers[normalize_field_name(name)] = handler
+    return handlers
+
+
+def _iter_entry_points(group):
+    """
+    Iterate over the entry points that are registered in `group`.
+
+    :param str group: the entry point group
+    :return: iterable of entry points that have ``name`` and ``load``
+
+    :mod:`importlib.metadata` only reads the distribution metadata
+    whereas importing :mod:`pkg_resources` scans every installed
+    distribution up front, so it is only used on interpreters that do
+    not have the former.
+
+    """
+    try:
+        from importlib import metadata
+    except ImportError:
+        try:
+            import importlib_metadata as metadata
+        except ImportError:
+            metadata = None
+
+    if metadata is not None:
+        entry_points = metadata.entry_points()
+        if hasattr(entry_points, 'select'):  # python >= 3.10
+            return entry_points.select(group=group)
+        return entry_points.get(group, [])
+
+    try:
+        import pkg_resources
+    except ImportError:
+        return []
+    return pkg_resources.iter_entry_points(group)
+
+
+def _render_paragraph(document, node):
+    """
+    Render a paragraph node with :class:`ParagraphVisitor`.
+
+    :param docutils.nodes.document document: document containing `node`
+    :param docutils.nodes.paragraph node: the paragraph to render
+    :return: the rendered paragraph
+    :rtype: str
+
+    The rendered text is remembered for the life of `document` so that
+    boilerplate paragraphs which repeat across endpoints are only
+    rendered once.  Paragraphs are matched by :func:`_paragraph_key`
+    instead of by source text since the same source can resolve to
+    different targets, for example anonymous references and
+    auto-numbered footnotes.
+
+    """
+    cache = _paragraph_cache.setdefault(document, {})
+    key = _paragraph_key(node)
+    if key in cache:
+        return cache[key]
+
+    visitor = ParagraphVisitor(document)
+    node.walkabout(visitor)
+    rendered = cache[key] = visitor.get_paragraph()
+    return rendered
+
+
+def _paragraph_key(node):
+    """
+    Describe everything about `node` that :class:`ParagraphVisitor` uses.
+
+    :param docutils.nodes.Node node: the node to describe
+    :return: a hashable description of the node type, reference
+        target, and text of `node` and its descendants
+    :rtype: tuple
+
+    """
+    if isinstance(node, nodes.Text):
+        return node.astext()
+    return (node.__class__.__name__, node.get('refuri'),
+            tuple(_paragraph_key(child) for child in node.children))
+
+
 def _generate_debug_tree(node):
     n = {'type': node.__class__.__name__,
          # 'attributes': node.attributes if hasattr(node, 'attributes') else {},